@@ -0,0 +1,33 @@
+from fastapi import HTTPException, Query
+
+MAX_BATCH_IDS = 500
+IN_CHUNK = 10000  # ids per IN list, well below the driver's bind parameter limit
+
+
+def batch_ids(ids: list[str] = Query(..., description="Repeated or comma-separated ids")) -> list[int]:
+    """Parse ``?ids=1,2&ids=3`` into distinct ids, keeping request order."""
+    try:
+        parsed = [int(part) for value in ids for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(422, "ids must be integers")
+    parsed = list(dict.fromkeys(parsed))
+    if not parsed or len(parsed) > MAX_BATCH_IDS:
+        raise HTTPException(422, f"Pass between 1 and {MAX_BATCH_IDS} ids")
+    return parsed
+
+
+def include_param(*allowed: str):
+    """Dependency parsing a comma-separated ``include`` limited to ``allowed``."""
+    def parse(include: str = "") -> set[str]:
+        parts = {part.strip() for part in include.split(",") if part.strip()}
+        unknown = sorted(parts - set(allowed))
+        if unknown:
+            raise HTTPException(422, f"Unknown include(s): {', '.join(unknown)}; allowed: {', '.join(allowed)}")
+        return parts
+    return parse
+
+
+def chunks(ids: list[int], size: int = IN_CHUNK):
+    """Split ``ids`` for ``IN`` filters that would otherwise exceed the bind parameter limit."""
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal, get_db
+from .models import CatalogVersion
+from .streaming import wants_stream
+
+# The counter lives in the database so every instance agrees on it; each
+# instance re-reads it at most every CATALOG_VERSION_CHECK_SECONDS, and
+# immediately after one of its own write transactions commits.
+CHECK_SECONDS = float(os.getenv("CATALOG_VERSION_CHECK_SECONDS", "5"))
+
+_lock = threading.Lock()
+_version: int | None = None
+_checked_at = 0.0
+
+
+def current_catalog_version(db: Session) -> int:
+    global _version, _checked_at
+    now = time.monotonic()
+    if _version is not None and now - _checked_at < CHECK_SECONDS:
+        return _version
+    version = db.scalar(select(CatalogVersion.version).where(CatalogVersion.id == 1)) or 0
+    with _lock:
+        _version, _checked_at = version, now
+    return version
+
+
+def bump_catalog_version(db: Session) -> int | None:
+    """Increment the catalog version inside the caller's transaction and return the new value."""
+    version = db.scalar(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == 1)
+        .values(version=CatalogVersion.version + 1)
+        .returning(CatalogVersion.version)
+    )
+    db.info["catalog_changed"] = True
+    return version
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate_after_commit(session: Session):
+    global _version
+    if session.info.pop("catalog_changed", False):
+        with _lock:
+            _version = None
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_after_rollback(session: Session):
+    session.info.pop("catalog_changed", None)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def _check_etag(request: Request, response: Response, etag: str, **headers: str) -> str:
+    headers = {"ETag": etag, "Cache-Control": "no-cache", **headers}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(304, headers=headers)
+    response.headers.update(headers)
+    return etag
+
+
+def catalog_etag(request: Request, response: Response, db: Session = Depends(get_db)) -> str:
+    """Route dependency: answer 304 before the handler runs if the client copy is current."""
+    return _check_etag(request, response, f'"catalog-{current_catalog_version(db)}"')
+
+
+def streamable_catalog_etag(
+    request: Request, response: Response, stream: bool = False, db: Session = Depends(get_db),
+) -> str:
+    """catalog_etag for routes that can also answer in NDJSON (app.streaming).
+
+    The NDJSON body gets its own tag so a cached JSON copy never validates it,
+    and Vary: Accept because the choice can come from the Accept header.
+    """
+    suffix = "-ndjson" if wants_stream(request, stream) else ""
+    return _check_etag(request, response, f'"catalog-{current_catalog_version(db)}{suffix}"', Vary="Accept")
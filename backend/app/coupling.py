@@ -0,0 +1,226 @@
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from sqlalchemy import case, select
+from sqlalchemy.orm import Session
+
+from .models import AppColumnXref, Application, CatalogVersion, UsageType
+
+if TYPE_CHECKING:
+    import numpy as np
+
+log = logging.getLogger(__name__)
+
+# numpy is imported by the functions that use it, so importing the app (every
+# worker start, every CLI run) does not pay for it until the first coupling
+# request builds the matrix.
+
+READ, WRITE = 1, 2  # usage bit flags; READ_WRITE is READ | WRITE
+
+# A column used by n applications contributes n*(n-1)/2 pairs. Below
+# DENSE_MIN_APPS those pairs are expanded and counted directly; widely shared
+# columns (audit fields, tenant keys) are multiplied as dense blocks instead,
+# where the cost depends on the number of applications rather than on n**2.
+DENSE_MIN_APPS = 256
+DENSE_CHUNK = 1024
+PAIR_BATCH = 4_000_000
+
+
+def _pair_counts(apps, writes, read_only, starts, sizes, n, shared, ww, rr):
+    """Count app pairs in the given column groups of the incidence arrays.
+
+    Applications are ascending within each group, so pairing every entry with
+    the entries after it yields each pair once, in the upper triangle.
+    """
+    import numpy as np
+
+    if not len(sizes):
+        return
+    ends = np.cumsum(sizes.astype(np.int64) * (sizes - 1) // 2)
+    for lo, hi in _batches(ends):
+        group_sizes, group_starts = sizes[lo:hi], starts[lo:hi]
+        offset = _ranges(group_sizes)
+        entry = np.repeat(group_starts, group_sizes) + offset
+        reps = np.repeat(group_sizes, group_sizes) - 1 - offset
+        left = np.repeat(entry, reps)
+        right = left + 1 + _ranges(reps)
+        keys = apps[left].astype(np.int64) * n + apps[right]
+        shared += np.bincount(keys, minlength=n * n).reshape(n, n).astype(np.int32)
+        mask = writes[left] & writes[right]
+        ww += np.bincount(keys[mask], minlength=n * n).reshape(n, n).astype(np.int32)
+        mask = read_only[left] & read_only[right]
+        rr += np.bincount(keys[mask], minlength=n * n).reshape(n, n).astype(np.int32)
+
+
+def _batches(ends):
+    import numpy as np
+
+    lo = 0
+    while lo < len(ends):
+        base = ends[lo - 1] if lo else 0
+        hi = max(lo + 1, int(np.searchsorted(ends, base + PAIR_BATCH, side="right")))
+        yield lo, hi
+        lo = hi
+
+
+def _ranges(sizes):
+    """Concatenation of arange(s) for every s in sizes."""
+    import numpy as np
+
+    total = int(sizes.sum())
+    return np.arange(total) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+
+
+def _dense_counts(apps, writes, read_only, starts, sizes, n, shared, ww, rr):
+    import numpy as np
+
+    for lo in range(0, len(sizes), DENSE_CHUNK):
+        group_sizes, group_starts = sizes[lo:lo + DENSE_CHUNK], starts[lo:lo + DENSE_CHUNK]
+        entry = np.repeat(group_starts, group_sizes) + _ranges(group_sizes)
+        column = np.repeat(np.arange(len(group_sizes)), group_sizes)
+        # Only the applications present in this chunk take part in the product.
+        rows, local = np.unique(apps[entry], return_inverse=True)
+        w = np.zeros((len(rows), len(group_sizes)), np.float32)
+        r = np.zeros_like(w)
+        w[local[writes[entry]], column[writes[entry]]] = 1
+        r[local[read_only[entry]], column[read_only[entry]]] = 1
+        block = np.ix_(rows, rows) if len(rows) < n else np.s_[:, :]
+        ww_block, rr_block, wr = w @ w.T, r @ r.T, w @ r.T
+        ww[block] += ww_block.astype(np.int32)
+        rr[block] += rr_block.astype(np.int32)
+        shared[block] += (ww_block + rr_block + wr + wr.T).astype(np.int32)
+
+
+def coupling_counts(app_ids: "np.ndarray", column_ids: "np.ndarray", usage: "np.ndarray"):
+    """App x app matrices of shared columns, write/write and read/read pairs.
+
+    ``usage`` holds READ/WRITE bit flags per xref. Returns the distinct
+    application ids (row order) and the three int32 matrices; only the upper
+    triangle (row < column) is meaningful.
+    """
+    import numpy as np
+
+    app_index = np.flatnonzero(np.bincount(app_ids)) if len(app_ids) else np.empty(0, np.int64)
+    n = len(app_index)
+    shared = np.zeros((n, n), np.int32)
+    ww = np.zeros((n, n), np.int32)
+    rr = np.zeros((n, n), np.int32)
+    if not n:
+        return app_index, shared, ww, rr
+
+    lookup = np.zeros(app_index[-1] + 1, np.int64)
+    lookup[app_index] = np.arange(n)
+    # One sort of a packed (column, app, usage) key orders the xrefs by
+    # column and then application; far cheaper than an argsort and gathers.
+    key = np.sort((column_ids.astype(np.int64) * n + lookup[app_ids]) * 4 + usage)
+    apps = (key >> 2) % n
+    columns = (key >> 2) // n
+    writes = (key & WRITE) > 0
+    read_only = (key & 3) == READ
+    starts = np.flatnonzero(np.concatenate(([True], columns[1:] != columns[:-1])))
+    sizes = np.diff(np.append(starts, len(key)))
+
+    small = (sizes >= 2) & (sizes < DENSE_MIN_APPS)
+    _pair_counts(apps, writes, read_only, starts[small], sizes[small], n, shared, ww, rr)
+    large = sizes >= DENSE_MIN_APPS
+    _dense_counts(apps, writes, read_only, starts[large], sizes[large], n, shared, ww, rr)
+    return app_index, shared, ww, rr
+
+
+class CouplingMatrix:
+    """Application pairs that share at least one column, at one catalog version.
+
+    Pairs are kept once (a < b) as parallel arrays so scoring and ranking a
+    request is a handful of vectorized operations.
+    """
+
+    def __init__(self):
+        self.version: int | None = None
+        self.built_at: float | None = None
+        self.build_seconds: float | None = None
+        self.names: dict[int, str] = {}
+        self.app_a = self.app_b = None  # parallel numpy arrays, set by load()
+        self.shared = self.read_read = self.read_write = self.write_write = None
+        self._lock = threading.Lock()
+
+    def load(self, version: int, app_ids, column_ids, usage, names: dict[int, str]):
+        import numpy as np
+
+        app_index, shared, ww, rr = coupling_counts(app_ids, column_ids, usage)
+        a, b = np.nonzero(np.triu(shared, 1))
+        self.app_a, self.app_b = app_index[a], app_index[b]
+        self.shared, self.write_write, self.read_read = shared[a, b], ww[a, b], rr[a, b]
+        # Every shared column is read/read, write/write, or has exactly one writer.
+        self.read_write = self.shared - self.write_write - self.read_read
+        self.names = names
+        self.version = version
+        self.built_at = time.time()
+
+    def rebuild(self, db: Session):
+        import numpy as np
+
+        started = time.perf_counter()
+        # Read the version before the xrefs so the data is never older than it.
+        version = db.scalar(select(CatalogVersion.version).where(CatalogVersion.id == 1)) or 0
+        flags = case(
+            (AppColumnXref.usage_type == UsageType.READ, READ),
+            (AppColumnXref.usage_type == UsageType.WRITE, WRITE),
+            else_=READ | WRITE,
+        )
+        rows = db.execute(select(AppColumnXref.application_id, AppColumnXref.column_id, flags)).all()
+        data = np.array(rows, dtype=np.int64).reshape(-1, 3)
+        names = dict(db.execute(select(Application.id, Application.name)).all())
+        self.load(version, data[:, 0], data[:, 1], data[:, 2], names)
+        self.build_seconds = round(time.perf_counter() - started, 3)
+        log.info(
+            "coupling matrix: %d xrefs, %d app pairs at catalog version %s in %.2fs",
+            len(rows), len(self.shared), version, self.build_seconds,
+        )
+
+    def ensure(self, db: Session, version: int):
+        # rebuild() may pick up a version newer than the caller's throttled one.
+        with self._lock:
+            if self.version is None or self.version < version:
+                self.rebuild(db)
+
+    def ranked(
+        self,
+        application_id: int | None = None,
+        min_shared: int = 1,
+        weights: tuple[float, float, float] = (1.0, 2.0, 4.0),
+        limit: int = 100,
+    ) -> tuple[int, list[dict]]:
+        """Pairs ordered by weighted score; returns (total matching, top ``limit``)."""
+        import numpy as np
+
+        read_w, read_write_w, write_w = weights
+        score = read_w * self.read_read + read_write_w * self.read_write + write_w * self.write_write
+        mask = self.shared >= min_shared
+        if application_id is not None:
+            mask &= (self.app_a == application_id) | (self.app_b == application_id)
+        idx = np.flatnonzero(mask)
+        if limit < len(idx):
+            idx = idx[np.argpartition(-score[idx], limit - 1)[:limit]]
+        idx = idx[np.lexsort((self.app_b[idx], self.app_a[idx], -score[idx]))]
+        pairs = []
+        for i in idx.tolist():
+            a, b = int(self.app_a[i]), int(self.app_b[i])
+            if application_id is not None and b == application_id:
+                a, b = b, a
+            pairs.append({
+                "application_id": a,
+                "application_name": self.names.get(a),
+                "other_application_id": b,
+                "other_application_name": self.names.get(b),
+                "shared_columns": int(self.shared[i]),
+                "read_read": int(self.read_read[i]),
+                "read_write": int(self.read_write[i]),
+                "write_write": int(self.write_write[i]),
+                "score": float(score[i]),
+            })
+        return int(mask.sum()), pairs
+
+
+coupling_matrix = CouplingMatrix()
@@ -1,25 +1,49 @@
+# Imported first so the startup clock also covers the imports below.
+from .startup import FirstRequestTimer, MODE as STARTUP_MODE, mark, startup_report  # isort: skip
+
+import logging
+import threading
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
 from fastapi.middleware.cors import CORSMiddleware
 
-from .database import Base, SessionLocal, engine
-from .routers import applications, tables, xref
-from .seed import seed
+from .compression import CompressionMiddleware
+from .database import engine
+from .metrics import MetricsMiddleware, metrics_response
+from .profiling import SQLProfileMiddleware
+from .routers import analytics, applications, catalog, suggest, tables, xref
+from .responses import FastJSONResponse
+from .search import detect_search_indexes
+from .suggest import ENABLED as SUGGEST_ENABLED, suggest_index
+
+log = logging.getLogger(__name__)
+
+
+def _warm_up():
+    try:
+        detect_search_indexes(engine)
+    except Exception:
+        log.exception("connection warm-up failed; the first request will retry")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
-    db = SessionLocal()
-    try:
-        seed(db)
-    finally:
-        db.close()
+    if STARTUP_MODE == "fast":
+        threading.Thread(target=_warm_up, name="db-warm-up", daemon=True).start()
+    else:
+        from .migrate import setup  # alembic is only needed on this path
+
+        setup()
+    if SUGGEST_ENABLED:
+        suggest_index.rebuild_in_background()
+    mark("ready")
     yield
 
 
-app = FastAPI(title="CSNX Meta", lifespan=lifespan)
+app = FastAPI(title="CSNX Meta", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -27,12 +51,43 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(SQLProfileMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(FirstRequestTimer)
 
+app.include_router(analytics.router)
 app.include_router(applications.router)
+app.include_router(catalog.router)
+app.include_router(suggest.router)
 app.include_router(tables.router)
 app.include_router(xref.router)
 
+mark("import")
+
 
 @app.get("/api/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/api/health/startup")
+def startup_timing():
+    return startup_report()
+
+
+@app.get("/api/health/ready")
+def ready():
+    """503 until the database answers, so traffic only reaches instances that can serve it."""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as exc:  # connector and driver errors are not all SQLAlchemyError
+        log.warning("readiness check failed: %s", exc)
+        return JSONResponse({"status": "unavailable"}, status_code=503)
+    return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
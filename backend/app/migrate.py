@@ -0,0 +1,109 @@
+"""Schema migrations for the catalog database.
+
+    python -m app.migrate setup                migrate and seed
+    python -m app.migrate upgrade [REVISION]   apply migrations (default: head)
+    python -m app.migrate downgrade REVISION   revert migrations down to REVISION
+    python -m app.migrate check                compare the live schema with the models
+    python -m app.migrate current              show the applied revision
+    python -m app.migrate revision -m MSG      create a new autogenerated revision
+"""
+import argparse
+import os
+import sys
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # The pg_trgm search indexes (0003) are optional and absent without the extension.
+    if type_ == "index" and name and name.endswith("_trgm"):
+        return False
+    return True
+
+
+def alembic_config() -> Config:
+    cfg = Config()
+    cfg.set_main_option("script_location", MIGRATIONS_DIR)
+    return cfg
+
+
+def upgrade(revision: str = "head"):
+    command.upgrade(alembic_config(), revision)
+
+
+def downgrade(revision: str):
+    command.downgrade(alembic_config(), revision)
+
+
+def setup():
+    """Everything a fresh or outdated database needs before the API can serve it."""
+    from .database import SessionLocal, engine
+    from .search import detect_search_indexes
+    from .seed import seed
+
+    upgrade()
+    detect_search_indexes(engine)
+    db = SessionLocal()
+    try:
+        seed(db)
+    finally:
+        db.close()
+
+
+def check_schema() -> list[str]:
+    """Return human-readable differences between the live schema and the models."""
+    from . import models  # noqa: F401  (registers the tables on Base.metadata)
+    from .database import Base, engine
+
+    problems = []
+    head = ScriptDirectory.from_config(alembic_config()).get_current_head()
+    with engine.connect() as conn:
+        ctx = MigrationContext.configure(conn, opts={"include_object": include_object})
+        current = ctx.get_current_revision()
+        if current != head:
+            problems.append(f"database is at revision {current}, code expects {head}")
+        problems += [repr(diff) for diff in compare_metadata(ctx, Base.metadata)]
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.migrate", description="Catalog schema migrations")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("setup")
+    up = sub.add_parser("upgrade")
+    up.add_argument("revision", nargs="?", default="head")
+    down = sub.add_parser("downgrade")
+    down.add_argument("revision")
+    sub.add_parser("check")
+    sub.add_parser("current")
+    rev = sub.add_parser("revision")
+    rev.add_argument("-m", "--message", required=True)
+    args = parser.parse_args()
+
+    if args.cmd == "setup":
+        setup()
+    elif args.cmd == "upgrade":
+        upgrade(args.revision)
+    elif args.cmd == "downgrade":
+        downgrade(args.revision)
+    elif args.cmd == "current":
+        command.current(alembic_config(), verbose=True)
+    elif args.cmd == "revision":
+        command.revision(alembic_config(), message=args.message, autogenerate=True)
+    else:
+        problems = check_schema()
+        for problem in problems:
+            print(problem)
+        if problems:
+            sys.exit(1)
+        print("Schema matches models.")
+
+
+if __name__ == "__main__":
+    main()
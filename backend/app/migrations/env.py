@@ -0,0 +1,32 @@
+from alembic import context
+from sqlalchemy import text
+
+from app import models  # noqa: F401  (registers the tables on Base.metadata)
+from app.database import Base, engine
+from app.migrate import include_object
+
+# Arbitrary constant; serialises migrations when several instances boot at once.
+MIGRATION_LOCK_KEY = 74_216_001
+
+
+def run_migrations_online():
+    with engine.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        connection.commit()
+        try:
+            context.configure(
+                connection=connection,
+                target_metadata=Base.metadata,
+                include_object=include_object,
+                transaction_per_migration=True,
+            )
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            connection.commit()
+
+
+if context.is_offline_mode():
+    raise SystemExit("Offline (--sql) migrations are not supported")
+run_migrations_online()
@@ -0,0 +1,29 @@
+"""Helpers shared by the revisions in versions/."""
+from contextlib import contextmanager
+
+import sqlalchemy as sa
+from alembic import op
+
+
+@contextmanager
+def autocommit_block():
+    """op.get_context().autocommit_block() that also holds under pg8000.
+
+    Alembic reads the isolation level after committing the migration's
+    transaction. pg8000 opens a transaction for that query and keeps it when
+    autocommit is switched on, so CONCURRENTLY statements would still run
+    inside a transaction block. The DB-API commit() ends it; under psycopg2 it
+    is a no-op in autocommit mode.
+    """
+    with op.get_context().autocommit_block():
+        op.get_bind().connection.dbapi_connection.commit()
+        yield
+
+
+def index_state(name: str) -> bool | None:
+    """True if the index is valid, False if a failed concurrent build left it invalid, None if absent."""
+    # Through text() so SQLAlchemy renders the driver's paramstyle (pg8000 only takes %s).
+    return op.get_bind().execute(
+        sa.text("SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"),
+        {"name": name},
+    ).scalar()
@@ -0,0 +1,73 @@
+"""Baseline: the catalog tables as previously created by create_all
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+Databases created before migrations existed already have these tables, so
+each one is only created if it is missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "applications" not in existing:
+        op.create_table(
+            "applications",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("name", sa.String(255), nullable=False, unique=True),
+            sa.Column("description", sa.Text),
+        )
+    if "db_tables" not in existing:
+        op.create_table(
+            "db_tables",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("schema_name", sa.String(255), nullable=False),
+            sa.Column("table_name", sa.String(255), nullable=False),
+            sa.Column("description", sa.Text),
+        )
+    if "db_columns" not in existing:
+        op.create_table(
+            "db_columns",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("table_id", sa.Integer, sa.ForeignKey("db_tables.id"), nullable=False),
+            sa.Column("column_name", sa.String(255), nullable=False),
+            sa.Column("data_type", sa.String(100), nullable=False),
+            sa.Column("description", sa.Text),
+        )
+    if "app_column_xref" not in existing:
+        op.create_table(
+            "app_column_xref",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("application_id", sa.Integer, sa.ForeignKey("applications.id"), nullable=False),
+            sa.Column("column_id", sa.Integer, sa.ForeignKey("db_columns.id"), nullable=False),
+            sa.Column(
+                "usage_type",
+                sa.Enum("READ", "WRITE", "READ_WRITE", name="usagetype"),
+                nullable=False,
+            ),
+        )
+    if "catalog_version" not in existing:
+        op.create_table(
+            "catalog_version",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("version", sa.BigInteger, nullable=False),
+        )
+    op.execute("INSERT INTO catalog_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING")
+
+
+def downgrade():
+    op.drop_table("app_column_xref")
+    op.drop_table("db_columns")
+    op.drop_table("db_tables")
+    op.drop_table("applications")
+    op.drop_table("catalog_version")
+    sa.Enum(name="usagetype").drop(op.get_bind(), checkfirst=True)
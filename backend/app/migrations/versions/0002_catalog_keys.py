@@ -0,0 +1,122 @@
+"""Natural-key unique constraints and foreign-key indexes for the catalog
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+Repeated imports left duplicate tables, columns and xrefs behind, so they
+are merged first. The oldest row of each key survives, and duplicate xrefs
+collapse to the combined usage. The indexes are then built CONCURRENTLY
+outside a transaction so reads and writes continue during the build, and the
+unique ones are attached as constraints afterwards.
+
+The composite unique indexes also serve lookups on their leading column
+(app_column_xref.application_id, db_columns.table_id), so those columns get
+no separate index.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from app.migrations.helpers import autocommit_block, index_state
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+MERGE_DUPLICATES = [
+    """
+    CREATE TEMP TABLE _table_map ON COMMIT DROP AS
+    SELECT id AS dup_id, keep_id FROM (
+        SELECT id, MIN(id) OVER (PARTITION BY schema_name, table_name) AS keep_id
+        FROM db_tables
+    ) t
+    WHERE id <> keep_id
+    """,
+    """
+    CREATE TEMP TABLE _column_map ON COMMIT DROP AS
+    SELECT id AS dup_id, keep_id FROM (
+        SELECT c.id,
+               MIN(c.id) OVER (PARTITION BY COALESCE(m.keep_id, c.table_id), c.column_name) AS keep_id
+        FROM db_columns c
+        LEFT JOIN _table_map m ON m.dup_id = c.table_id
+    ) c
+    WHERE id <> keep_id
+    """,
+    # Surviving columns of duplicate tables move to the surviving table.
+    """
+    UPDATE db_columns c SET table_id = m.keep_id
+    FROM _table_map m
+    WHERE c.table_id = m.dup_id
+      AND NOT EXISTS (SELECT 1 FROM _column_map cm WHERE cm.dup_id = c.id)
+    """,
+    "UPDATE app_column_xref x SET column_id = cm.keep_id FROM _column_map cm WHERE x.column_id = cm.dup_id",
+    "DELETE FROM db_columns c USING _column_map cm WHERE c.id = cm.dup_id",
+    "DELETE FROM db_tables t USING _table_map m WHERE t.id = m.dup_id",
+    """
+    UPDATE app_column_xref x
+    SET usage_type = CASE
+        WHEN g.reads AND g.writes THEN 'READ_WRITE'::usagetype
+        WHEN g.writes THEN 'WRITE'::usagetype
+        ELSE 'READ'::usagetype
+    END
+    FROM (
+        SELECT id,
+               MIN(id) OVER w AS keep_id,
+               bool_or(usage_type IN ('READ', 'READ_WRITE')) OVER w AS reads,
+               bool_or(usage_type IN ('WRITE', 'READ_WRITE')) OVER w AS writes
+        FROM app_column_xref
+        WINDOW w AS (PARTITION BY application_id, column_id)
+    ) g
+    WHERE x.id = g.id AND g.id = g.keep_id
+    """,
+    """
+    DELETE FROM app_column_xref x
+    USING (
+        SELECT id, MIN(id) OVER (PARTITION BY application_id, column_id) AS keep_id
+        FROM app_column_xref
+    ) g
+    WHERE x.id = g.id AND g.id <> g.keep_id
+    """,
+    "UPDATE catalog_version SET version = version + 1 WHERE id = 1",
+]
+
+INDEXES = [
+    ("uq_db_tables_schema_table", "CREATE UNIQUE INDEX CONCURRENTLY {name} ON db_tables (schema_name, table_name)"),
+    ("uq_db_columns_table_column", "CREATE UNIQUE INDEX CONCURRENTLY {name} ON db_columns (table_id, column_name)"),
+    ("uq_app_column_xref_app_column",
+     "CREATE UNIQUE INDEX CONCURRENTLY {name} ON app_column_xref (application_id, column_id)"),
+    ("ix_app_column_xref_column_id", "CREATE INDEX CONCURRENTLY {name} ON app_column_xref (column_id)"),
+]
+
+CONSTRAINTS = [
+    ("db_tables", "uq_db_tables_schema_table"),
+    ("db_columns", "uq_db_columns_table_column"),
+    ("app_column_xref", "uq_app_column_xref_app_column"),
+]
+
+
+def upgrade():
+    for statement in MERGE_DUPLICATES:
+        op.execute(statement)
+
+    with autocommit_block():
+        for name, ddl in INDEXES:
+            state = index_state(name)
+            if state is False:
+                op.execute(f"DROP INDEX CONCURRENTLY {name}")
+            if state is not True:
+                op.execute(ddl.format(name=name))
+
+    existing = {
+        row[0] for row in op.get_bind().execute(sa.text("SELECT conname FROM pg_constraint WHERE contype = 'u'"))
+    }
+    for table, name in CONSTRAINTS:
+        if name not in existing:
+            op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}")
+
+
+def downgrade():
+    op.drop_index("ix_app_column_xref_column_id", table_name="app_column_xref")
+    for table, name in CONSTRAINTS:
+        op.drop_constraint(name, table, type_="unique")
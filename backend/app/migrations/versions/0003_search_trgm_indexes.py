@@ -0,0 +1,56 @@
+"""pg_trgm indexes for /api/search and the catalog ILIKE filters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+The GIN indexes are built CONCURRENTLY outside a transaction, as in 0002, so
+writes to the catalog tables continue during the build. pg_trgm is optional:
+if the extension cannot be installed the indexes are skipped and search
+falls back to unindexed ILIKE ranking. To build them once it is available:
+
+    python -m app.migrate downgrade 0002 && python -m app.migrate upgrade
+"""
+import logging
+
+from alembic import op
+from sqlalchemy.exc import DBAPIError
+
+from app.migrations.helpers import autocommit_block, index_state
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+log = logging.getLogger("alembic.runtime.migration")
+
+INDEXES = [
+    ("ix_applications_name_trgm", "applications", "name"),
+    ("ix_applications_description_trgm", "applications", "description"),
+    ("ix_db_tables_table_name_trgm", "db_tables", "table_name"),
+    ("ix_db_tables_description_trgm", "db_tables", "description"),
+    ("ix_db_columns_column_name_trgm", "db_columns", "column_name"),
+    ("ix_db_columns_description_trgm", "db_columns", "description"),
+]
+
+
+def upgrade():
+    with autocommit_block():
+        try:
+            op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except DBAPIError as exc:
+            log.warning("pg_trgm unavailable, skipping the search indexes: %s", exc.orig)
+            return
+        for name, table, column in INDEXES:
+            state = index_state(name)
+            if state is False:
+                op.execute(f"DROP INDEX CONCURRENTLY {name}")
+            if state is not True:
+                op.execute(f"CREATE INDEX CONCURRENTLY {name} ON {table} USING gin ({column} gin_trgm_ops)")
+
+
+def downgrade():
+    with autocommit_block():
+        for name, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import BigInteger, Enum, ForeignKey, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import Base
@@ -24,6 +24,7 @@ class Application(Base):
 
 class DbTable(Base):
     __tablename__ = "db_tables"
+    __table_args__ = (UniqueConstraint("schema_name", "table_name", name="uq_db_tables_schema_table"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     schema_name: Mapped[str] = mapped_column(String(255), nullable=False, default="public")
@@ -35,6 +36,8 @@ class DbTable(Base):
 
 class DbColumn(Base):
     __tablename__ = "db_columns"
+    # Also serves lookups by table_id (leading column).
+    __table_args__ = (UniqueConstraint("table_id", "column_name", name="uq_db_columns_table_column"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     table_id: Mapped[int] = mapped_column(ForeignKey("db_tables.id"), nullable=False)
@@ -48,11 +51,20 @@ class DbColumn(Base):
 
 class AppColumnXref(Base):
     __tablename__ = "app_column_xref"
+    # Also serves lookups by application_id (leading column).
+    __table_args__ = (UniqueConstraint("application_id", "column_id", name="uq_app_column_xref_app_column"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     application_id: Mapped[int] = mapped_column(ForeignKey("applications.id"), nullable=False)
-    column_id: Mapped[int] = mapped_column(ForeignKey("db_columns.id"), nullable=False)
+    column_id: Mapped[int] = mapped_column(ForeignKey("db_columns.id"), nullable=False, index=True)
     usage_type: Mapped[UsageType] = mapped_column(Enum(UsageType), nullable=False)
 
     application: Mapped["Application"] = relationship(back_populates="xrefs")
     column: Mapped["DbColumn"] = relationship(back_populates="xrefs")
+
+
+class CatalogVersion(Base):
+    __tablename__ = "catalog_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,70 @@
+import base64
+import json
+import os
+
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.orm import Session
+
+from .rows import fetch_dicts
+
+DEFAULT_PAGE_SIZE = int(os.getenv("CATALOG_PAGE_SIZE", "500"))
+MAX_PAGE_SIZE = 5000
+
+
+def encode_cursor(values: tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> tuple:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(400, "Invalid cursor")
+    return tuple(values)
+
+
+class PageParams:
+    """Query parameters shared by the keyset-paginated list endpoints."""
+
+    def __init__(
+        self,
+        cursor: str | None = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        include_total: bool = True,
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.include_total = include_total
+
+
+def paginate(
+    db: Session, stmt: Select, keys: list, page: PageParams, request: Request, response: Response,
+    scalars: bool = True,
+) -> list:
+    """Run ``stmt`` one keyset page at a time, ordered by ``keys``.
+
+    ``keys`` must end in a unique column so the ordering is total. The cursor
+    for the following page is returned in X-Next-Cursor and a Link header;
+    X-Total-Count is the size of the whole unpaginated result. With
+    ``scalars`` False, ``stmt`` selects plain columns and the page comes back
+    as dicts from fetch_dicts(), without ORM hydration.
+    """
+    if page.include_total:
+        total = db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+        response.headers["X-Total-Count"] = str(total)
+
+    if page.cursor:
+        stmt = stmt.where(tuple_(*keys) > tuple_(*decode_cursor(page.cursor, len(keys))))
+    stmt = stmt.order_by(*keys).limit(page.limit + 1)
+    rows = db.scalars(stmt).all() if scalars else fetch_dicts(db, stmt)
+
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        cursor = encode_cursor(tuple(getattr(last, key.key) if scalars else last[key.key] for key in keys))
+        response.headers["X-Next-Cursor"] = cursor
+        response.headers["Link"] = f'<{request.url.include_query_params(cursor=cursor)}>; rel="next"'
+    return rows
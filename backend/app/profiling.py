@@ -0,0 +1,150 @@
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from starlette.datastructures import Headers, MutableHeaders
+
+from .metrics import route_template
+
+log = logging.getLogger(__name__)
+
+# "off" (default), "header" (only requests sending `X-SQL-Profile: 1`) or
+# "on" (every request). Reports list statement shapes, so keep it off, or on
+# "header" behind an authenticating proxy, in production.
+MODE = os.getenv("SQL_PROFILE", "off")
+HEADER = "x-sql-profile"
+MAX_QUERIES = int(os.getenv("SQL_PROFILE_MAX_QUERIES", "25"))
+MAX_DB_MS = float(os.getenv("SQL_PROFILE_MAX_DB_MS", "250"))
+REPORTED_SHAPES = 3
+
+# Expanded IN lists ("IN (%(id_1_1)s, %(id_1_2)s, ...)") differ by length only.
+_PARAM_LIST = re.compile(r"\(\s*(?:(?:%(?:\(\w+\))?s|\?|:\w+|\$\d+)\s*,\s*)+(?:%(?:\(\w+\))?s|\?|:\w+|\$\d+)\s*\)")
+
+
+def shape(statement: str) -> str:
+    return _PARAM_LIST.sub("(...)", " ".join(statement.split()))
+
+
+class Profile:
+    """Statements executed while this profile was current."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[shape(statement)] += 1
+
+    def repeated(self, limit: int = REPORTED_SHAPES) -> list[tuple[str, int]]:
+        """The most repeated statement shapes; a shape run per row is an N+1."""
+        return [(s, n) for s, n in self.shapes.most_common(limit) if n > 1]
+
+    def over_budget(self, max_queries: int = MAX_QUERIES, max_ms: float = MAX_DB_MS) -> bool:
+        return self.count > max_queries or self.seconds * 1000 > max_ms
+
+    def server_timing(self) -> str:
+        entries = [f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries"']
+        for i, (statement, n) in enumerate(self.repeated(), 1):
+            entries.append(f'db-repeat-{i};desc="{n}x {_quoted(statement[:100])}"')
+        return ", ".join(entries)
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries, {self.seconds * 1000:.1f} ms"]
+        lines += [f"  {n}x {statement}" for statement, n in self.shapes.most_common()]
+        return "\n".join(lines)
+
+
+def _quoted(text: str) -> str:
+    text = text.replace("\\", "\\\\").replace('"', '\\"')
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+
+_current: ContextVar[Profile | None] = ContextVar("sql_profile", default=None)
+
+
+def profile_engine(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            context.profile_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        profile = _current.get()
+        if profile is not None and hasattr(context, "profile_started"):
+            profile.record(statement, time.perf_counter() - context.profile_started)
+
+
+class SQLProfileMiddleware:
+    """ASGI middleware reporting each profiled request's statements in Server-Timing.
+
+    Statements a streaming body runs after the headers went out are only
+    counted in the budget log line.
+    """
+
+    def __init__(self, app, mode: str = MODE):
+        self.app = app
+        self.mode = mode
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.mode not in ("on", "header"):
+            return await self.app(scope, receive, send)
+        if self.mode == "header" and Headers(scope=scope).get(HEADER) != "1":
+            return await self.app(scope, receive, send)
+        profile = Profile()
+        token = _current.set(profile)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if profile.over_budget():
+                log.warning(
+                    "SQL budget exceeded by %s %s (%s): %s",
+                    scope["method"], scope["path"], route_template(scope), profile.report(),
+                )
+
+
+@contextmanager
+def count_queries(engine=None):
+    """Record every statement ``engine`` runs inside the block, from any thread.
+
+    For tests, where the test client serves the request on another thread
+    (tests/support.py wraps this as assert_max_queries):
+
+        with count_queries() as profile:
+            client.get("/api/tables/1")
+        assert profile.count <= 3, profile.report()
+    """
+    if engine is None:
+        from .database import engine
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        context.count_started = time.perf_counter()
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        if hasattr(context, "count_started"):  # not one that was already running
+            profile.record(statement, time.perf_counter() - context.count_started)
+
+    profile = Profile()
+    event.listen(engine, "before_cursor_execute", before)
+    event.listen(engine, "after_cursor_execute", after)
+    try:
+        yield profile
+    finally:
+        event.remove(engine, "before_cursor_execute", before)
+        event.remove(engine, "after_cursor_execute", after)
+
@@ -0,0 +1,29 @@
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def _default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson encoding; Pydantic models are dumped as they are, not validated again."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def fast_json(content, response: Response) -> FastJSONResponse:
+    """Send ``content`` without the route's response_model validation pass.
+
+    For payloads built straight from database rows, or from models that were
+    validated when they were constructed. Headers that dependencies set on the
+    injected ``response`` (ETag, paging) are carried over.
+    """
+    out = FastJSONResponse(content)
+    out.raw_headers.extend(response.headers.raw)
+    return out
@@ -0,0 +1,162 @@
+import threading
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import distinct, func, select, tuple_
+from sqlalchemy.orm import Session
+
+from ..catalog_version import catalog_etag, current_catalog_version
+from ..coupling import coupling_matrix
+from ..database import get_db
+from ..models import AppColumnXref, Application, DbColumn, DbTable, UsageType
+from ..responses import fast_json
+from ..schemas import CouplingPair, ImpactSummary
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+# Whole-schema impact summaries, keyed by (schema, include_columns) and valid
+# for one catalog version.
+_schema_impact: dict[tuple[str, bool], tuple[int, ImpactSummary]] = {}
+_schema_impact_lock = threading.Lock()
+_SCHEMA_IMPACT_MAX = 64
+
+
+@router.get(
+    "/coupling",
+    response_model=list[CouplingPair],
+    dependencies=[Depends(catalog_etag)],
+)
+def coupling(
+    response: Response,
+    application_id: int | None = None,
+    min_shared: int = Query(1, ge=1),
+    read_weight: float = 1.0,
+    read_write_weight: float = 2.0,
+    write_write_weight: float = 4.0,
+    limit: int = Query(100, ge=1, le=10000),
+    db: Session = Depends(get_db),
+):
+    """Application pairs that share columns, highest weighted score first.
+
+    Each shared column counts once as read/read, read/write (exactly one of the
+    two writes) or write/write; READ_WRITE usage counts as a writer.
+    """
+    coupling_matrix.ensure(db, current_catalog_version(db))
+    total, pairs = coupling_matrix.ranked(
+        application_id,
+        min_shared,
+        (read_weight, read_write_weight, write_write_weight),
+        limit,
+    )
+    response.headers["X-Total-Count"] = str(total)
+    return fast_json(pairs, response)
+
+
+@router.get("/impact", response_model=ImpactSummary, dependencies=[Depends(catalog_etag)])
+def impact(
+    table_id: int | None = None,
+    schema_name: str | None = None,
+    column_id: list[int] | None = Query(None),
+    include_columns: bool = True,
+    db: Session = Depends(get_db),
+):
+    """Applications touching a table, a schema or a set of columns, rolled up in one query."""
+    if sum(x is not None for x in (table_id, schema_name, column_id)) != 1:
+        raise HTTPException(422, "Pass exactly one of table_id, schema_name or column_id")
+    if table_id is not None and not db.get(DbTable, table_id):
+        raise HTTPException(404, "Table not found")
+    if schema_name is None:
+        return _impact(db, table_id, schema_name, column_id, include_columns)
+
+    version = current_catalog_version(db)
+    key = (schema_name, include_columns)
+    cached = _schema_impact.get(key)
+    if cached and cached[0] >= version:
+        return cached[1]
+    summary = _impact(db, table_id, schema_name, column_id, include_columns)
+    with _schema_impact_lock:
+        if len(_schema_impact) >= _SCHEMA_IMPACT_MAX:
+            _schema_impact.clear()
+        _schema_impact[key] = (version, summary)
+    return summary
+
+
+def _impact(db: Session, table_id, schema_name, column_ids, include_columns: bool) -> ImpactSummary:
+    usage = AppColumnXref.usage_type
+    app_set = [Application.id.label("application_id"), Application.name.label("application_name")]
+    column_set = [
+        DbColumn.id.label("column_id"), DbColumn.column_name.label("column_name"),
+        DbTable.id.label("table_id"), DbTable.table_name.label("table_name"),
+    ]
+    grouping_sets = [app_set, column_set, []] if include_columns else [app_set, []]
+    stmt = (
+        select(
+            # 0 on the per-application rows, 1 on the per-column and totals rows.
+            func.grouping(Application.id).label("level"),
+            *(col for cols in grouping_sets for col in cols),
+            func.count(distinct(DbColumn.id)).label("columns"),
+            func.count(distinct(AppColumnXref.column_id)).label("referenced_columns"),
+            func.count(distinct(AppColumnXref.application_id)).label("applications"),
+            func.count(distinct(AppColumnXref.application_id)).filter(
+                usage.in_([UsageType.WRITE, UsageType.READ_WRITE])
+            ).label("writers"),
+            func.count(AppColumnXref.id).filter(usage == UsageType.READ).label("read"),
+            func.count(AppColumnXref.id).filter(usage == UsageType.WRITE).label("write"),
+            func.count(AppColumnXref.id).filter(usage == UsageType.READ_WRITE).label("read_write"),
+        )
+        .select_from(DbColumn)
+        .join(DbTable, DbColumn.table_id == DbTable.id)
+        .outerjoin(AppColumnXref, AppColumnXref.column_id == DbColumn.id)
+        .outerjoin(Application, AppColumnXref.application_id == Application.id)
+        .group_by(func.grouping_sets(*(tuple_(*(col.element for col in cols)) for cols in grouping_sets)))
+    )
+    if table_id is not None:
+        stmt = stmt.where(DbColumn.table_id == table_id)
+    elif schema_name is not None:
+        stmt = stmt.where(DbTable.schema_name == schema_name)
+    else:
+        stmt = stmt.where(DbColumn.id.in_(column_ids))
+
+    apps, columns, total = [], [], None
+    for row in db.execute(stmt).all():
+        counts = {"read": row.read, "write": row.write, "read_write": row.read_write}
+        if row.level == 0:
+            if row.application_id is not None:  # skip the group of unreferenced columns
+                apps.append({
+                    "application_id": row.application_id,
+                    "application_name": row.application_name,
+                    "usage_type": _strongest(row),
+                    "columns": row.referenced_columns,
+                    "usage": counts,
+                })
+        elif include_columns and row.column_id is not None:
+            columns.append({
+                "column_id": row.column_id,
+                "column_name": row.column_name,
+                "table_id": row.table_id,
+                "table_name": row.table_name,
+                "applications": row.applications,
+                "writers": row.writers,
+                "usage": counts,
+            })
+        else:
+            total = row
+
+    order = {UsageType.READ_WRITE: 0, UsageType.WRITE: 1, UsageType.READ: 2}
+    apps.sort(key=lambda a: (order[a["usage_type"]], a["application_name"]))
+    columns.sort(key=lambda c: (c["table_name"], c["column_name"]))
+    # The empty grouping set always yields the totals row, even for no columns.
+    return ImpactSummary(
+        columns=total.columns,
+        referenced_columns=total.referenced_columns,
+        applications=total.applications,
+        writers=total.writers,
+        usage={"read": total.read, "write": total.write, "read_write": total.read_write},
+        by_application=apps,
+        by_column=columns,
+    )
+
+
+def _strongest(row) -> UsageType:
+    if row.read_write or (row.read and row.write):
+        return UsageType.READ_WRITE
+    return UsageType.WRITE if row.write else UsageType.READ
@@ -1,60 +1,92 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 
+from ..batch import batch_ids
+from ..catalog_version import bump_catalog_version, catalog_etag
 from ..database import get_db
 from ..models import Application, AppColumnXref, DbColumn, DbTable
+from ..pagination import PageParams, paginate
+from ..responses import fast_json
 from ..schemas import ApplicationCreate, ApplicationDetail, ApplicationOut, ColumnBrief
+from ..suggest import suggest_index
 
 router = APIRouter(prefix="/api/applications", tags=["applications"])
 
 
-@router.get("", response_model=list[ApplicationOut])
-def list_applications(search: str | None = None, db: Session = Depends(get_db)):
+@router.get("", response_model=list[ApplicationOut], dependencies=[Depends(catalog_etag)])
+def list_applications(
+    request: Request,
+    response: Response,
+    search: str | None = None,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+):
     stmt = select(Application)
     if search:
         stmt = stmt.where(Application.name.ilike(f"%{search}%"))
-    stmt = stmt.order_by(Application.name)
-    return db.scalars(stmt).all()
+    apps = paginate(db, stmt, [Application.name, Application.id], page, request, response)
+    return fast_json([{"id": app.id, "name": app.name, "description": app.description} for app in apps], response)
 
 
 @router.post("", response_model=ApplicationOut, status_code=201)
 def create_application(body: ApplicationCreate, db: Session = Depends(get_db)):
     app = Application(name=body.name, description=body.description)
     db.add(app)
+    version = bump_catalog_version(db)
     db.commit()
     db.refresh(app)
+    suggest_index.apply(version, added=[("application", app.id, app.name)])
     return app
 
 
-@router.get("/{app_id}", response_model=ApplicationDetail)
+@router.get("/batch", response_model=list[ApplicationDetail], dependencies=[Depends(catalog_etag)])
+def get_applications(response: Response, ids: list[int] = Depends(batch_ids), db: Session = Depends(get_db)):
+    """Several application details in request order; unknown ids are left out."""
+    return fast_json(load_applications(db, ids), response)
+
+
+@router.get("/{app_id}", response_model=ApplicationDetail, dependencies=[Depends(catalog_etag)])
 def get_application(app_id: int, db: Session = Depends(get_db)):
-    app = db.get(Application, app_id)
-    if not app:
+    apps = load_applications(db, [app_id])
+    if not apps:
         raise HTTPException(404, "Application not found")
+    return apps[0]
+
 
-    stmt = (
-        select(AppColumnXref, DbColumn, DbTable)
+def load_applications(db: Session, ids: list[int]) -> list[ApplicationDetail]:
+    """Two statements however many ids: the applications, then all their columns."""
+    apps = {
+        app.id: app
+        for app in db.scalars(select(Application).where(Application.id.in_(ids)).options(raiseload("*")))
+    }
+    rows = db.execute(
+        select(
+            AppColumnXref.application_id, AppColumnXref.usage_type,
+            DbColumn.id, DbColumn.column_name, DbColumn.data_type,
+            DbTable.table_name, DbTable.schema_name,
+        )
         .join(DbColumn, AppColumnXref.column_id == DbColumn.id)
         .join(DbTable, DbColumn.table_id == DbTable.id)
-        .where(AppColumnXref.application_id == app_id)
+        .where(AppColumnXref.application_id.in_(ids))
         .order_by(DbTable.table_name, DbColumn.column_name)
     )
-    rows = db.execute(stmt).all()
-    columns = [
-        ColumnBrief(
-            id=col.id,
-            column_name=col.column_name,
-            data_type=col.data_type,
-            table_name=tbl.table_name,
-            schema_name=tbl.schema_name,
-            usage_type=xref.usage_type,
+    columns: dict[int, list[ColumnBrief]] = {}
+    for row in rows:
+        columns.setdefault(row.application_id, []).append(ColumnBrief(
+            id=row.id,
+            column_name=row.column_name,
+            data_type=row.data_type,
+            table_name=row.table_name,
+            schema_name=row.schema_name,
+            usage_type=row.usage_type,
+        ))
+    return [
+        ApplicationDetail(
+            id=app.id,
+            name=app.name,
+            description=app.description,
+            columns=columns.get(app.id, []),
         )
-        for xref, col, tbl in rows
+        for app in (apps[i] for i in ids if i in apps)
     ]
-    return ApplicationDetail(
-        id=app.id,
-        name=app.name,
-        description=app.description,
-        columns=columns,
-    )
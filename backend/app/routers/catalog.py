@@ -0,0 +1,311 @@
+import hashlib
+import json
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import delete, literal_column, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from ..batch import chunks
+from ..catalog_version import bump_catalog_version, catalog_etag
+from ..database import get_db
+from ..models import AppColumnXref, Application, DbColumn, DbTable
+from ..schemas import (
+    CatalogIngest,
+    CatalogIngestResult,
+    CatalogSchemaIn,
+    CatalogTableRef,
+    CatalogXrefIn,
+    IngestCounts,
+    TableFingerprint,
+)
+
+router = APIRouter(prefix="/api/catalog", tags=["catalog"])
+
+
+@router.post("/ingest", response_model=CatalogIngestResult)
+def ingest_catalog(body: CatalogIngest, db: Session = Depends(get_db)):
+    result = CatalogIngestResult(tables=IngestCounts(), columns=IngestCounts(), xrefs=IngestCounts())
+    drop_tables(db, body.drop_tables, result)
+    table_ids = upsert_tables(db, body.schemas, result.tables)
+    upsert_columns(db, body.schemas, table_ids, result, prune=body.prune_columns)
+    upsert_xrefs(db, body.xrefs, result.xrefs)
+    if any(c.inserted or c.updated or c.deleted for c in (result.tables, result.columns, result.xrefs)):
+        bump_catalog_version(db)
+    db.commit()
+    return result
+
+
+def table_fingerprint(description: str | None, columns: list[tuple[str, str, str | None]]) -> str:
+    """Hash of a table's description and its (name, type, description) columns.
+
+    scripts/import_db2.py computes the same value from SYSCAT; keep the two in step.
+    """
+    ordered = sorted(columns, key=lambda c: (c[0], c[1], c[2] or ""))
+    doc = json.dumps([description, ordered], separators=(",", ":"))
+    return hashlib.sha1(doc.encode()).hexdigest()
+
+
+@router.get(
+    "/fingerprints",
+    response_model=list[TableFingerprint],
+    dependencies=[Depends(catalog_etag)],
+)
+def list_fingerprints(schema_name: str, table_pattern: str = "%", db: Session = Depends(get_db)):
+    rows = db.execute(
+        select(
+            DbTable.id, DbTable.schema_name, DbTable.table_name,
+            DbTable.description.label("table_description"),
+            DbColumn.column_name, DbColumn.data_type, DbColumn.description,
+        )
+        .outerjoin(DbColumn, DbColumn.table_id == DbTable.id)
+        .where(DbTable.schema_name == schema_name, DbTable.table_name.like(table_pattern))
+        .order_by(DbTable.id)
+    )
+    tables: dict[tuple[str, str], tuple] = {}
+    for row in rows:
+        table_id, _, columns = tables.setdefault(
+            (row.schema_name, row.table_name), (row.id, row.table_description, []),
+        )
+        if table_id == row.id and row.column_name is not None:
+            columns.append((row.column_name, row.data_type, row.description))
+    return [
+        TableFingerprint(
+            id=table_id,
+            schema_name=schema,
+            table_name=table,
+            fingerprint=table_fingerprint(description, columns),
+        )
+        for (schema, table), (table_id, description, columns) in tables.items()
+    ]
+
+
+# Each step reads the existing rows for the tables named in the batch, diffs
+# them in memory and writes the difference with one batched multi-row
+# INSERT ... RETURNING plus one executemany UPDATE by primary key. RETURNING
+# is requested even where the ids are not needed because it is what makes
+# pg8000 batch the rows into multi-VALUES statements. The inserts upsert on
+# the natural-key constraints, so a row another ingest added after the read
+# is updated in place instead of failing the whole batch; RETURNING tells
+# the two apart so the counts stay exact under concurrent ingests.
+
+def _upsert(model, constraint: str, *updated: str):
+    """Multi-row INSERT into ``model`` that overwrites ``updated`` on a ``constraint`` conflict.
+
+    Conflicting rows whose ``updated`` values already match are left alone and
+    not returned. Each returned row has ``inserted``: xmax is 0 only for a
+    tuple this statement inserted, not for one it updated.
+    """
+    stmt = pg_insert(model)
+    columns = model.__table__.c
+    return stmt.on_conflict_do_update(
+        constraint=constraint,
+        set_={c: stmt.excluded[c] for c in updated},
+        where=or_(*(columns[c].is_distinct_from(stmt.excluded[c]) for c in updated)),
+    ).returning(model.id, literal_column("xmax = 0").label("inserted"))
+
+
+def _count_upserted(counts: IngestCounts, rows: list, attempted: int):
+    inserted = sum(1 for row in rows if row.inserted)
+    counts.inserted += inserted
+    counts.updated += len(rows) - inserted
+    counts.unchanged += attempted - len(rows)
+
+
+def _by_table_key(keys: set[tuple[str, str]]):
+    """One ``(schema_name, table_name) IN (...)`` condition per chunk of ``keys``."""
+    for chunk in chunks(sorted(keys)):
+        yield tuple_(DbTable.schema_name, DbTable.table_name).in_(chunk)
+
+
+def _by_table_id(table_ids):
+    for chunk in chunks(sorted(table_ids)):
+        yield DbColumn.table_id.in_(chunk)
+
+
+def _table_rows(db: Session, keys: set[tuple[str, str]]) -> dict[tuple[str, str], tuple]:
+    rows = {}
+    for condition in _by_table_key(keys):
+        for row in db.execute(
+            select(DbTable.id, DbTable.schema_name, DbTable.table_name, DbTable.description).where(condition)
+        ):
+            rows[(row.schema_name, row.table_name)] = row
+    return rows
+
+
+def _column_rows(db: Session, conditions) -> dict[tuple[str, str, str], tuple]:
+    """Existing columns keyed by (schema, table, column), one query per condition."""
+    rows = {}
+    for condition in conditions:
+        for row in db.execute(
+            select(
+                DbColumn.id, DbColumn.data_type, DbColumn.description, DbColumn.column_name,
+                DbTable.schema_name, DbTable.table_name,
+            )
+            .join(DbTable, DbColumn.table_id == DbTable.id)
+            .where(condition)
+        ):
+            rows[(row.schema_name, row.table_name, row.column_name)] = row
+    return rows
+
+
+def _delete_columns(db: Session, column_ids: list[int], result: CatalogIngestResult):
+    for chunk in chunks(column_ids):
+        result.xrefs.deleted += db.execute(
+            delete(AppColumnXref).where(AppColumnXref.column_id.in_(chunk))
+        ).rowcount
+        result.columns.deleted += db.execute(delete(DbColumn).where(DbColumn.id.in_(chunk))).rowcount
+
+
+def drop_tables(db: Session, refs: list[CatalogTableRef], result: CatalogIngestResult):
+    wanted = {(r.schema_name, r.table_name) for r in refs}
+    if not wanted:
+        return
+
+    table_ids = [row.id for row in _table_rows(db, wanted).values()]
+    column_ids = []
+    for condition in _by_table_id(table_ids):
+        column_ids.extend(db.scalars(select(DbColumn.id).where(condition)))
+    _delete_columns(db, column_ids, result)
+    for chunk in chunks(table_ids):
+        result.tables.deleted += db.execute(delete(DbTable).where(DbTable.id.in_(chunk))).rowcount
+
+
+def upsert_tables(
+    db: Session, schemas: list[CatalogSchemaIn], counts: IngestCounts,
+) -> dict[tuple[str, str], int]:
+    wanted = {
+        (s.schema_name, t.table_name): t.description
+        for s in schemas
+        for t in s.tables
+    }
+    if not wanted:
+        return {}
+
+    existing = _table_rows(db, wanted.keys())
+    table_ids = {key: row.id for key, row in existing.items()}
+    to_insert, to_update = [], []
+    for (schema, table), description in wanted.items():
+        row = existing.get((schema, table))
+        if row is None:
+            to_insert.append({"schema_name": schema, "table_name": table, "description": description})
+        elif row.description != description:
+            to_update.append({"id": row.id, "description": description})
+        else:
+            counts.unchanged += 1
+
+    if to_insert:
+        rows = db.execute(
+            _upsert(DbTable, "uq_db_tables_schema_table", "description")
+            .returning(DbTable.schema_name, DbTable.table_name),
+            to_insert,
+        ).all()
+        _count_upserted(counts, rows, len(to_insert))
+        table_ids.update(((row.schema_name, row.table_name), row.id) for row in rows)
+        # Added concurrently with the same description: not returned, look them up.
+        missing = wanted.keys() - table_ids.keys()
+        if missing:
+            table_ids.update((key, row.id) for key, row in _table_rows(db, missing).items())
+    if to_update:
+        db.execute(update(DbTable), to_update)
+    counts.updated += len(to_update)
+    return table_ids
+
+
+def upsert_columns(
+    db: Session,
+    schemas: list[CatalogSchemaIn],
+    table_ids: dict[tuple[str, str], int],
+    result: CatalogIngestResult,
+    prune: bool = False,
+):
+    listed = {(s.schema_name, t.table_name) for s in schemas for t in s.tables}
+    wanted = {
+        (s.schema_name, t.table_name, c.column_name): c
+        for s in schemas
+        for t in s.tables
+        for c in t.columns
+    }
+    if not wanted and not (prune and listed):
+        return
+
+    existing = _column_rows(db, _by_table_id({table_ids[key] for key in listed}))
+    if prune:
+        stale = [row.id for key, row in existing.items() if key not in wanted]
+        _delete_columns(db, stale, result)
+
+    counts = result.columns
+    to_insert, to_update = [], []
+    for (schema, table, column), c in wanted.items():
+        row = existing.get((schema, table, column))
+        if row is None:
+            to_insert.append({
+                "table_id": table_ids[(schema, table)],
+                "column_name": column,
+                "data_type": c.data_type,
+                "description": c.description,
+            })
+        elif (row.data_type, row.description) != (c.data_type, c.description):
+            to_update.append({"id": row.id, "data_type": c.data_type, "description": c.description})
+        else:
+            counts.unchanged += 1
+
+    if to_insert:
+        rows = db.execute(
+            _upsert(DbColumn, "uq_db_columns_table_column", "data_type", "description"), to_insert,
+        ).all()
+        _count_upserted(counts, rows, len(to_insert))
+    if to_update:
+        db.execute(update(DbColumn), to_update)
+    counts.updated += len(to_update)
+
+
+def upsert_xrefs(db: Session, xrefs: list[CatalogXrefIn], counts: IngestCounts):
+    if not xrefs:
+        return
+
+    app_ids = dict(db.execute(
+        select(Application.name, Application.id)
+        .where(Application.name.in_({x.application_name for x in xrefs}))
+    ).all())
+    columns = _column_rows(db, _by_table_key({(x.schema_name, x.table_name) for x in xrefs}))
+
+    unknown_apps = sorted({x.application_name for x in xrefs} - app_ids.keys())
+    if unknown_apps:
+        raise HTTPException(422, f"Unknown application(s): {', '.join(unknown_apps)}")
+    unknown_cols = sorted(
+        f"{x.schema_name}.{x.table_name}.{x.column_name}"
+        for x in xrefs
+        if (x.schema_name, x.table_name, x.column_name) not in columns
+    )
+    if unknown_cols:
+        raise HTTPException(422, f"Unknown column(s): {', '.join(unknown_cols)}")
+
+    wanted = {
+        (app_ids[x.application_name], columns[(x.schema_name, x.table_name, x.column_name)].id): x.usage_type
+        for x in xrefs
+    }
+    existing = {}
+    for chunk in chunks(sorted({col_id for _, col_id in wanted})):
+        for row in db.execute(
+            select(AppColumnXref.id, AppColumnXref.application_id, AppColumnXref.column_id, AppColumnXref.usage_type)
+            .where(AppColumnXref.application_id.in_(list(app_ids.values())), AppColumnXref.column_id.in_(chunk))
+        ):
+            existing[(row.application_id, row.column_id)] = row
+
+    to_insert, to_update = [], []
+    for (app_id, col_id), usage in wanted.items():
+        row = existing.get((app_id, col_id))
+        if row is None:
+            to_insert.append({"application_id": app_id, "column_id": col_id, "usage_type": usage})
+        elif row.usage_type != usage:
+            to_update.append({"id": row.id, "usage_type": usage})
+        else:
+            counts.unchanged += 1
+
+    if to_insert:
+        rows = db.execute(_upsert(AppColumnXref, "uq_app_column_xref_app_column", "usage_type"), to_insert).all()
+        _count_upserted(counts, rows, len(to_insert))
+    if to_update:
+        db.execute(update(AppColumnXref), to_update)
+    counts.updated += len(to_update)
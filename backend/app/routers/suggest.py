@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ..catalog_version import current_catalog_version
+from ..database import get_db
+from ..schemas import Suggestion
+from ..suggest import ENABLED, suggest_index
+
+router = APIRouter(prefix="/api/suggest", tags=["suggest"])
+
+
+@router.get("", response_model=list[Suggestion])
+def suggest(
+    q: str,
+    k: int = Query(10, ge=1, le=100),
+    type: list[str] | None = Query(None),
+    db: Session = Depends(get_db),
+):
+    if not ENABLED:
+        raise HTTPException(503, "Suggestion index is disabled (set SUGGEST_INDEX=1)")
+    if suggest_index.version != current_catalog_version(db):
+        suggest_index.rebuild_in_background()
+    if suggest_index.built_at is None:
+        raise HTTPException(503, "Suggestion index is still building")
+    return suggest_index.suggest(q, k, set(type) if type else None)
+
+
+@router.get("/stats")
+def suggest_stats():
+    return suggest_index.stats()
@@ -1,39 +1,118 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, raiseload, selectinload
 
+from ..batch import batch_ids, include_param
+from ..catalog_version import bump_catalog_version, catalog_etag, streamable_catalog_etag
 from ..database import get_db
 from ..models import AppColumnXref, Application, DbColumn, DbTable
+from ..pagination import PageParams, paginate
+from ..responses import fast_json
+from ..streaming import ndjson_response, wants_stream
 from ..schemas import (
     AppBrief,
     DbColumnCreate,
     DbColumnDetail,
     DbColumnOut,
+    DbColumnUsage,
+    DbTableBatchItem,
     DbTableCreate,
     DbTableDetail,
     DbTableOut,
 )
+from ..suggest import suggest_index
 
 router = APIRouter(prefix="/api", tags=["tables & columns"])
 
 
 # --- Tables ---
 
-@router.get("/tables", response_model=list[DbTableOut])
-def list_tables(search: str | None = None, db: Session = Depends(get_db)):
-    stmt = select(DbTable)
+@router.get("/tables", response_model=list[DbTableOut], dependencies=[Depends(catalog_etag)])
+def list_tables(
+    request: Request,
+    response: Response,
+    search: str | None = None,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    stmt = select(DbTable.id, DbTable.schema_name, DbTable.table_name, DbTable.description)
     if search:
         stmt = stmt.where(DbTable.table_name.ilike(f"%{search}%"))
-    stmt = stmt.order_by(DbTable.schema_name, DbTable.table_name)
-    return db.scalars(stmt).all()
+    keys = [DbTable.schema_name, DbTable.table_name, DbTable.id]
+    return fast_json(paginate(db, stmt, keys, page, request, response, scalars=False), response)
 
 
-@router.get("/tables/{table_id}", response_model=DbTableDetail)
+@router.get("/tables/batch", response_model=list[DbTableBatchItem], dependencies=[Depends(catalog_etag)])
+def get_tables(
+    response: Response,
+    ids: list[int] = Depends(batch_ids),
+    include: set[str] = Depends(include_param("columns", "apps")),
+    db: Session = Depends(get_db),
+):
+    """Several tables in request order; unknown ids are left out. ``apps`` implies ``columns``."""
+    return fast_json(load_tables(db, ids, include), response)
+
+
+@router.get("/tables/{table_id}", response_model=DbTableDetail, dependencies=[Depends(catalog_etag)])
 def get_table(table_id: int, db: Session = Depends(get_db)):
-    tbl = db.get(DbTable, table_id)
-    if not tbl:
+    tables = load_tables(db, [table_id], {"columns"})
+    if not tables:
         raise HTTPException(404, "Table not found")
-    return tbl
+    return tables[0]
+
+
+# The loaders below issue a fixed number of statements however many ids are
+# requested, and raiseload("*") turns any lazy load that slips in into an error.
+
+def load_tables(db: Session, ids: list[int], include: set[str]) -> list[DbTableBatchItem]:
+    with_columns = bool(include & {"columns", "apps"})
+    stmt = select(DbTable).where(DbTable.id.in_(ids))
+    stmt = stmt.options(selectinload(DbTable.columns), raiseload("*")) if with_columns else stmt.options(raiseload("*"))
+    tables = {tbl.id: tbl for tbl in db.scalars(stmt)}
+    apps = column_apps(db, DbColumn.table_id.in_(ids)) if "apps" in include else None
+
+    result = []
+    for table_id in ids:
+        tbl = tables.get(table_id)
+        if tbl is None:
+            continue
+        columns = None
+        if with_columns:
+            columns = [
+                DbColumnUsage(
+                    id=col.id,
+                    table_id=col.table_id,
+                    column_name=col.column_name,
+                    data_type=col.data_type,
+                    description=col.description,
+                    apps=apps.get(col.id, []) if apps is not None else None,
+                )
+                for col in sorted(tbl.columns, key=lambda col: col.id)
+            ]
+        result.append(DbTableBatchItem(
+            id=tbl.id,
+            schema_name=tbl.schema_name,
+            table_name=tbl.table_name,
+            description=tbl.description,
+            columns=columns,
+        ))
+    return result
+
+
+def column_apps(db: Session, condition) -> dict[int, list[AppBrief]]:
+    """Applications using each column matched by ``condition``, in one query."""
+    rows = db.execute(
+        select(AppColumnXref.column_id, AppColumnXref.usage_type, Application.id, Application.name)
+        .join(Application, AppColumnXref.application_id == Application.id)
+        .join(DbColumn, AppColumnXref.column_id == DbColumn.id)
+        .where(condition)
+        .order_by(Application.name)
+    )
+    apps: dict[int, list[AppBrief]] = {}
+    for row in rows:
+        apps.setdefault(row.column_id, []).append(AppBrief(id=row.id, name=row.name, usage_type=row.usage_type))
+    return apps
 
 
 @router.post("/tables", response_model=DbTableOut, status_code=201)
@@ -44,8 +123,15 @@ def create_table(body: DbTableCreate, db: Session = Depends(get_db)):
         description=body.description,
     )
     db.add(tbl)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(409, "Table already exists")
+    version = bump_catalog_version(db)
     db.commit()
     db.refresh(tbl)
+    suggest_index.apply(version, added=[("table", tbl.id, f"{tbl.schema_name}.{tbl.table_name}")])
     return tbl
 
 
@@ -64,48 +150,74 @@ def create_columns(table_id: int, body: list[DbColumnCreate], db: Session = Depe
         )
         db.add(col)
         cols.append(col)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(409, "Column already exists on this table")
+    version = bump_catalog_version(db)
+    # The flush filled in every field; read them before commit expires them,
+    # instead of refreshing each column with its own SELECT afterwards.
+    out = [DbColumnOut.model_validate(col) for col in cols]
+    table_path = f"{tbl.schema_name}.{tbl.table_name}"
     db.commit()
-    for col in cols:
-        db.refresh(col)
-    return cols
+    suggest_index.apply(version, added=[("column", col.id, f"{table_path}.{col.column_name}") for col in out])
+    return out
 
 
 # --- Columns ---
 
-@router.get("/columns", response_model=list[DbColumnOut])
-def list_columns(search: str | None = None, db: Session = Depends(get_db)):
-    stmt = select(DbColumn)
+@router.get("/columns", response_model=list[DbColumnOut], dependencies=[Depends(streamable_catalog_etag)])
+def list_columns(
+    request: Request,
+    response: Response,
+    search: str | None = None,
+    stream: bool = False,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    stmt = select(DbColumn.id, DbColumn.table_id, DbColumn.column_name, DbColumn.data_type, DbColumn.description)
     if search:
         stmt = stmt.where(DbColumn.column_name.ilike(f"%{search}%"))
-    stmt = stmt.order_by(DbColumn.column_name)
-    return db.scalars(stmt).all()
+    if wants_stream(request, stream):
+        return ndjson_response(stmt.order_by(DbColumn.column_name, DbColumn.id), response)
+    keys = [DbColumn.column_name, DbColumn.id]
+    return fast_json(paginate(db, stmt, keys, page, request, response, scalars=False), response)
 
 
-@router.get("/columns/{column_id}", response_model=DbColumnDetail)
+@router.get("/columns/batch", response_model=list[DbColumnDetail], dependencies=[Depends(catalog_etag)])
+def get_columns(response: Response, ids: list[int] = Depends(batch_ids), db: Session = Depends(get_db)):
+    """Several column details in request order; unknown ids are left out."""
+    return fast_json(load_columns(db, ids), response)
+
+
+@router.get("/columns/{column_id}", response_model=DbColumnDetail, dependencies=[Depends(catalog_etag)])
 def get_column(column_id: int, db: Session = Depends(get_db)):
-    col = db.get(DbColumn, column_id)
-    if not col:
+    columns = load_columns(db, [column_id])
+    if not columns:
         raise HTTPException(404, "Column not found")
-    tbl = db.get(DbTable, col.table_id)
+    return columns[0]
 
-    stmt = (
-        select(AppColumnXref, Application)
-        .join(Application, AppColumnXref.application_id == Application.id)
-        .where(AppColumnXref.column_id == column_id)
-        .order_by(Application.name)
+
+def load_columns(db: Session, ids: list[int]) -> list[DbColumnDetail]:
+    rows = db.execute(
+        select(DbColumn, DbTable.table_name, DbTable.schema_name)
+        .join(DbTable, DbColumn.table_id == DbTable.id)
+        .where(DbColumn.id.in_(ids))
+        .options(raiseload("*"))
     )
-    rows = db.execute(stmt).all()
-    apps = [
-        AppBrief(id=a.id, name=a.name, usage_type=xref.usage_type)
-        for xref, a in rows
+    found = {col.id: (col, table_name, schema_name) for col, table_name, schema_name in rows}
+    apps = column_apps(db, AppColumnXref.column_id.in_(ids))
+    return [
+        DbColumnDetail(
+            id=col.id,
+            table_id=col.table_id,
+            column_name=col.column_name,
+            data_type=col.data_type,
+            description=col.description,
+            table_name=table_name,
+            schema_name=schema_name,
+            apps=apps.get(col.id, []),
+        )
+        for col, table_name, schema_name in (found[i] for i in ids if i in found)
     ]
-    return DbColumnDetail(
-        id=col.id,
-        table_id=col.table_id,
-        column_name=col.column_name,
-        data_type=col.data_type,
-        description=col.description,
-        table_name=tbl.table_name,
-        schema_name=tbl.schema_name,
-        apps=apps,
-    )
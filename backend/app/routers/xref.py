@@ -1,10 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import or_, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import case, delete, func, insert, literal, or_, select, union_all, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from ..batch import chunks
+from ..catalog_version import bump_catalog_version, catalog_etag, streamable_catalog_etag
+from .. import search
 from ..database import get_db
 from ..models import AppColumnXref, Application, DbColumn, DbTable
-from ..schemas import SearchResult, XrefCreate, XrefDetail, XrefOut
+from ..responses import fast_json
+from ..rows import fetch_dicts
+from ..schemas import (
+    IngestCounts,
+    SearchResult,
+    XrefBatch,
+    XrefCreate,
+    XrefDetail,
+    XrefOut,
+    XrefReplace,
+    XrefUsage,
+)
+from ..streaming import ndjson_response, wants_stream
+from ..suggest import suggest_index
 
 router = APIRouter(prefix="/api", tags=["cross-references"])
 
@@ -17,8 +34,21 @@ def create_xref(body: XrefCreate, db: Session = Depends(get_db)):
         usage_type=body.usage_type,
     )
     db.add(xref)
+    try:
+        db.flush()
+    except IntegrityError:
+        # A missing application or column fails its foreign key; only the
+        # unique (application, column) key means the xref already exists.
+        db.rollback()
+        if db.get(Application, body.application_id) is None:
+            raise HTTPException(404, "Application not found")
+        if db.get(DbColumn, body.column_id) is None:
+            raise HTTPException(422, f"Unknown column id(s): {body.column_id}")
+        raise HTTPException(409, "Xref already exists for this application and column")
+    version = bump_catalog_version(db)
     db.commit()
     db.refresh(xref)
+    suggest_index.apply(version)
     return xref
 
 
@@ -28,98 +58,210 @@ def delete_xref(xref_id: int, db: Session = Depends(get_db)):
     if not xref:
         raise HTTPException(404, "Xref not found")
     db.delete(xref)
+    version = bump_catalog_version(db)
     db.commit()
+    suggest_index.apply(version)
 
 
-@router.get("/xref/by-app/{app_id}", response_model=list[XrefDetail])
-def xref_by_app(app_id: int, db: Session = Depends(get_db)):
-    stmt = (
-        select(AppColumnXref, Application, DbColumn, DbTable)
-        .join(Application, AppColumnXref.application_id == Application.id)
-        .join(DbColumn, AppColumnXref.column_id == DbColumn.id)
-        .join(DbTable, DbColumn.table_id == DbTable.id)
-        .where(AppColumnXref.application_id == app_id)
-        .order_by(DbTable.table_name, DbColumn.column_name)
-    )
-    rows = db.execute(stmt).all()
-    return [
-        XrefDetail(
-            id=xref.id,
-            application_id=xref.application_id,
-            column_id=xref.column_id,
-            usage_type=xref.usage_type,
-            application_name=app.name,
-            column_name=col.column_name,
-            table_name=tbl.table_name,
-            schema_name=tbl.schema_name,
+@router.put("/xref/by-app/{app_id}", response_model=IngestCounts)
+def replace_xrefs(app_id: int, body: XrefReplace, db: Session = Depends(get_db)):
+    """Make ``body.xrefs`` the application's complete set of column usages."""
+    return _apply_xrefs(db, app_id, _usage_map(body.xrefs), remove=None)
+
+
+@router.patch("/xref/by-app/{app_id}", response_model=IngestCounts)
+def update_xrefs(app_id: int, body: XrefBatch, db: Session = Depends(get_db)):
+    """Add or re-type the usages in ``body.add`` and drop the columns in ``body.remove``."""
+    wanted = _usage_map(body.add)
+    both = sorted(wanted.keys() & set(body.remove))
+    if both:
+        raise HTTPException(422, f"Column id(s) both added and removed: {', '.join(map(str, both))}")
+    return _apply_xrefs(db, app_id, wanted, remove=set(body.remove))
+
+
+def _usage_map(usages: list[XrefUsage]) -> dict[int, str]:
+    wanted = {}
+    duplicates = set()
+    for x in usages:
+        if x.column_id in wanted:
+            duplicates.add(x.column_id)
+        wanted[x.column_id] = x.usage_type
+    if duplicates:
+        raise HTTPException(422, f"Duplicate column id(s): {', '.join(map(str, sorted(duplicates)))}")
+    return wanted
+
+
+def _apply_xrefs(db: Session, app_id: int, wanted: dict[int, str], remove: set[int] | None) -> IngestCounts:
+    """Diff the application's xrefs against ``wanted`` and write the difference.
+
+    With ``remove`` None every existing usage not in ``wanted`` is deleted
+    (replace); otherwise only the listed columns are. Inserts, updates and
+    deletes are each one batched statement, all in one transaction.
+    """
+    # Locking the application row serialises concurrent bulk writes for it.
+    if db.get(Application, app_id, with_for_update=True) is None:
+        raise HTTPException(404, "Application not found")
+
+    known = set()
+    for chunk in chunks(list(wanted)):
+        known.update(db.scalars(select(DbColumn.id).where(DbColumn.id.in_(chunk))))
+    unknown = sorted(wanted.keys() - known)
+    if unknown:
+        raise HTTPException(422, f"Unknown column id(s): {', '.join(map(str, unknown))}")
+
+    existing = {
+        row.column_id: row
+        for row in db.execute(
+            select(AppColumnXref.id, AppColumnXref.column_id, AppColumnXref.usage_type)
+            .where(AppColumnXref.application_id == app_id)
         )
-        for xref, app, col, tbl in rows
+    }
+    counts = IngestCounts()
+    to_insert, to_update = [], []
+    for col_id, usage in wanted.items():
+        row = existing.get(col_id)
+        if row is None:
+            to_insert.append({"application_id": app_id, "column_id": col_id, "usage_type": usage})
+        elif row.usage_type != usage:
+            to_update.append({"id": row.id, "usage_type": usage})
+        else:
+            counts.unchanged += 1
+    stale = [
+        row.id for col_id, row in existing.items()
+        if (col_id not in wanted if remove is None else col_id in remove)
     ]
 
+    if to_insert:
+        db.execute(insert(AppColumnXref).returning(AppColumnXref.id), to_insert)
+    if to_update:
+        db.execute(update(AppColumnXref), to_update)
+    for chunk in chunks(stale):
+        db.execute(delete(AppColumnXref).where(AppColumnXref.id.in_(chunk)))
+    counts.inserted, counts.updated, counts.deleted = len(to_insert), len(to_update), len(stale)
 
-@router.get("/xref/by-column/{col_id}", response_model=list[XrefDetail])
-def xref_by_column(col_id: int, db: Session = Depends(get_db)):
-    stmt = (
-        select(AppColumnXref, Application, DbColumn, DbTable)
+    if not (to_insert or to_update or stale):
+        return counts
+    version = bump_catalog_version(db)
+    db.commit()
+    suggest_index.apply(version)
+    return counts
+
+
+def _xref_details(condition):
+    """XrefDetail fields, by label, for the xrefs matching ``condition``."""
+    return (
+        select(
+            AppColumnXref.id,
+            AppColumnXref.application_id,
+            AppColumnXref.column_id,
+            AppColumnXref.usage_type,
+            Application.name.label("application_name"),
+            DbColumn.column_name,
+            DbTable.table_name,
+            DbTable.schema_name,
+        )
         .join(Application, AppColumnXref.application_id == Application.id)
         .join(DbColumn, AppColumnXref.column_id == DbColumn.id)
         .join(DbTable, DbColumn.table_id == DbTable.id)
-        .where(AppColumnXref.column_id == col_id)
-        .order_by(Application.name)
+        .where(condition)
     )
-    rows = db.execute(stmt).all()
-    return [
-        XrefDetail(
-            id=xref.id,
-            application_id=xref.application_id,
-            column_id=xref.column_id,
-            usage_type=xref.usage_type,
-            application_name=app.name,
-            column_name=col.column_name,
-            table_name=tbl.table_name,
-            schema_name=tbl.schema_name,
-        )
-        for xref, app, col, tbl in rows
-    ]
 
 
-@router.get("/search", response_model=list[SearchResult])
-def unified_search(q: str, db: Session = Depends(get_db)):
-    results: list[SearchResult] = []
-    like = f"%{q}%"
+@router.get(
+    "/xref/by-app/{app_id}",
+    response_model=list[XrefDetail],
+    dependencies=[Depends(streamable_catalog_etag)],
+)
+def xref_by_app(
+    app_id: int, request: Request, response: Response, stream: bool = False, db: Session = Depends(get_db),
+):
+    stmt = _xref_details(AppColumnXref.application_id == app_id).order_by(DbTable.table_name, DbColumn.column_name)
+    if wants_stream(request, stream):
+        return ndjson_response(stmt, response)
+    return fast_json(fetch_dicts(db, stmt), response)
+
+
+@router.get("/xref/by-column/{col_id}", response_model=list[XrefDetail], dependencies=[Depends(catalog_etag)])
+def xref_by_column(col_id: int, response: Response, db: Session = Depends(get_db)):
+    stmt = _xref_details(AppColumnXref.column_id == col_id).order_by(Application.name)
+    return fast_json(fetch_dicts(db, stmt), response)
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
-    # Applications
-    apps = db.scalars(
-        select(Application).where(
-            or_(Application.name.ilike(like), Application.description.ilike(like))
-        )
-    ).all()
-    for a in apps:
-        results.append(SearchResult(type="application", id=a.id, name=a.name, detail=a.description))
 
-    # Tables
-    tables = db.scalars(
-        select(DbTable).where(
-            or_(DbTable.table_name.ilike(like), DbTable.description.ilike(like))
+def _search_score(name, q: str):
+    escaped = _like_escape(q)
+    boost = case(
+        (func.lower(name) == q.lower(), 3.0),
+        (name.ilike(f"{escaped}%"), 2.0),
+        (name.ilike(f"%{escaped}%"), 1.0),
+        else_=0.0,
+    )
+    if search.trgm_enabled:
+        return boost + func.similarity(name, q)
+    return boost + 1.0 / (1 + func.length(name))
+
+
+@router.get("/search", response_model=list[SearchResult], dependencies=[Depends(catalog_etag)])
+def unified_search(
+    q: str,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    like = f"%{_like_escape(q)}%"
+    table_path = DbTable.schema_name + "." + DbTable.table_name
+
+    matches = union_all(
+        select(
+            literal("application").label("type"),
+            Application.id,
+            Application.name.label("name"),
+            Application.description.label("detail"),
+            _search_score(Application.name, q).label("score"),
+        ).where(or_(Application.name.ilike(like), Application.description.ilike(like))),
+        select(
+            literal("table"),
+            DbTable.id,
+            table_path,
+            DbTable.description,
+            _search_score(DbTable.table_name, q),
+        ).where(or_(DbTable.table_name.ilike(like), DbTable.description.ilike(like))),
+        select(
+            literal("column"),
+            DbColumn.id,
+            table_path + "." + DbColumn.column_name,
+            DbColumn.description,
+            _search_score(DbColumn.column_name, q),
         )
-    ).all()
-    for t in tables:
-        results.append(SearchResult(
-            type="table", id=t.id, name=f"{t.schema_name}.{t.table_name}", detail=t.description,
-        ))
-
-    # Columns
-    cols = db.execute(
-        select(DbColumn, DbTable)
         .join(DbTable, DbColumn.table_id == DbTable.id)
-        .where(or_(DbColumn.column_name.ilike(like), DbColumn.description.ilike(like)))
+        .where(or_(DbColumn.column_name.ilike(like), DbColumn.description.ilike(like))),
+    ).cte("matches")
+
+    facet_counts = (
+        select(matches.c.type, func.count().label("n"))
+        .group_by(matches.c.type)
+        .subquery()
+    )
+    facets = select(func.json_object_agg(facet_counts.c.type, facet_counts.c.n))
+    rows = db.execute(
+        select(matches, facets.scalar_subquery().label("facets"))
+        .order_by(matches.c.score.desc(), matches.c.name, matches.c.type, matches.c.id)
+        .limit(limit)
+        .offset(offset)
     ).all()
-    for col, tbl in cols:
-        results.append(SearchResult(
-            type="column",
-            id=col.id,
-            name=f"{tbl.schema_name}.{tbl.table_name}.{col.column_name}",
-            detail=col.description,
-        ))
-
-    return results
+
+    if rows:
+        counts = rows[0].facets
+    else:
+        # Paged past the last match: the totals still describe the whole result.
+        counts = (db.scalar(facets) if offset else None) or {}
+    response.headers["X-Total-Count"] = str(sum(counts.values()))
+    response.headers["X-Search-Facets"] = ",".join(f"{k}={v}" for k, v in sorted(counts.items()))
+    return fast_json([
+        {"type": r.type, "id": r.id, "name": r.name, "detail": r.detail, "score": round(r.score, 4)}
+        for r in rows
+    ], response)
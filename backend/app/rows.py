@@ -0,0 +1,13 @@
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+
+def fetch_dicts(db: Session, stmt: Select) -> list[dict]:
+    """Rows of a column-only ``stmt`` as dicts keyed by column label.
+
+    Runs on the session's connection, so no entities are built and nothing
+    enters the identity map; for read paths that only serialize the rows.
+    """
+    result = db.connection().execute(stmt)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
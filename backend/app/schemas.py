@@ -82,6 +82,14 @@ class DbColumnDetail(DbColumnOut):
     apps: list[AppBrief] = []
 
 
+class DbColumnUsage(DbColumnOut):
+    apps: list[AppBrief] | None = None  # None unless requested with include=apps
+
+
+class DbTableBatchItem(DbTableOut):
+    columns: list[DbColumnUsage] | None = None  # None unless requested with include=columns
+
+
 # --- Xref ---
 
 class XrefCreate(BaseModel):
@@ -106,6 +114,20 @@ class XrefDetail(XrefOut):
     schema_name: str
 
 
+class XrefUsage(BaseModel):
+    column_id: int
+    usage_type: UsageType
+
+
+class XrefReplace(BaseModel):
+    xrefs: list[XrefUsage]
+
+
+class XrefBatch(BaseModel):
+    add: list[XrefUsage] = []
+    remove: list[int] = []  # column ids
+
+
 # --- Search ---
 
 class SearchResult(BaseModel):
@@ -113,3 +135,120 @@ class SearchResult(BaseModel):
     id: int
     name: str
     detail: str | None = None
+    score: float | None = None
+
+
+# --- Bulk catalog ingest ---
+
+class CatalogColumnIn(BaseModel):
+    column_name: str
+    data_type: str
+    description: str | None = None
+
+
+class CatalogTableIn(BaseModel):
+    table_name: str
+    description: str | None = None
+    columns: list[CatalogColumnIn] = []
+
+
+class CatalogSchemaIn(BaseModel):
+    schema_name: str
+    tables: list[CatalogTableIn] = []
+
+
+class CatalogXrefIn(BaseModel):
+    application_name: str
+    schema_name: str
+    table_name: str
+    column_name: str
+    usage_type: UsageType
+
+
+class CatalogTableRef(BaseModel):
+    schema_name: str
+    table_name: str
+
+
+class CatalogIngest(BaseModel):
+    schemas: list[CatalogSchemaIn] = []
+    xrefs: list[CatalogXrefIn] = []
+    prune_columns: bool = False  # delete columns of listed tables that are missing from the payload
+    drop_tables: list[CatalogTableRef] = []
+
+
+class IngestCounts(BaseModel):
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+
+
+class CatalogIngestResult(BaseModel):
+    tables: IngestCounts
+    columns: IngestCounts
+    xrefs: IngestCounts
+
+
+class TableFingerprint(BaseModel):
+    id: int
+    schema_name: str
+    table_name: str
+    fingerprint: str
+
+
+# --- Suggest ---
+
+class Suggestion(BaseModel):
+    type: str  # "application", "table", "column"
+    id: int
+    name: str
+    score: float
+
+
+# --- Analytics ---
+
+class CouplingPair(BaseModel):
+    application_id: int
+    application_name: str | None
+    other_application_id: int
+    other_application_name: str | None
+    shared_columns: int
+    read_read: int
+    read_write: int
+    write_write: int
+    score: float
+
+
+class UsageCounts(BaseModel):
+    read: int = 0
+    write: int = 0
+    read_write: int = 0
+
+
+class ImpactApplication(BaseModel):
+    application_id: int
+    application_name: str
+    usage_type: UsageType  # strongest usage across the columns in scope
+    columns: int
+    usage: UsageCounts
+
+
+class ImpactColumn(BaseModel):
+    column_id: int
+    column_name: str
+    table_id: int
+    table_name: str
+    applications: int
+    writers: int
+    usage: UsageCounts
+
+
+class ImpactSummary(BaseModel):
+    columns: int
+    referenced_columns: int
+    applications: int
+    writers: int
+    usage: UsageCounts
+    by_application: list[ImpactApplication]
+    by_column: list[ImpactColumn] = []
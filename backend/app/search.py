@@ -0,0 +1,13 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+# With pg_trgm installed (and the GIN indexes of migration 0003), /api/search
+# ranks by similarity(); without it, by a plain ILIKE score.
+trgm_enabled = False
+
+
+def detect_search_indexes(engine: Engine) -> bool:
+    global trgm_enabled
+    with engine.connect() as conn:
+        trgm_enabled = bool(conn.scalar(text("SELECT count(*) FROM pg_extension WHERE extname = 'pg_trgm'")))
+    return trgm_enabled
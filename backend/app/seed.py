@@ -65,16 +65,20 @@ def seed(db: Session):
         ]),
     ]
 
+    tables = [
+        DbTable(schema_name=schema, table_name=tname, description=tdesc) for schema, tname, tdesc, _ in tables_data
+    ]
+    db.add_all(tables)
+    db.flush()
+
     all_columns: dict[str, DbColumn] = {}
-    for schema, tname, tdesc, cols in tables_data:
-        tbl = DbTable(schema_name=schema, table_name=tname, description=tdesc)
-        db.add(tbl)
-        db.flush()
+    for tbl, (_, tname, _, cols) in zip(tables, tables_data):
         for cname, dtype, cdesc in cols:
-            col = DbColumn(table_id=tbl.id, column_name=cname, data_type=dtype, description=cdesc)
-            db.add(col)
-            db.flush()
-            all_columns[f"{tname}.{cname}"] = col
+            all_columns[f"{tname}.{cname}"] = DbColumn(
+                table_id=tbl.id, column_name=cname, data_type=dtype, description=cdesc,
+            )
+    db.add_all(all_columns.values())
+    db.flush()
 
     # Cross-references
     c = all_columns
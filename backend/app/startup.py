@@ -0,0 +1,43 @@
+import logging
+import os
+import time
+
+log = logging.getLogger(__name__)
+
+# "full" (default) migrates, installs the search indexes and seeds on every
+# start, which suits local development. "fast" leaves all of that to the
+# one-shot `python -m app.migrate setup` and only warms the connection pool in
+# the background, so a scale-from-zero instance serves its first request as
+# early as possible.
+MODE = os.getenv("STARTUP_MODE", "full")
+
+_started = time.perf_counter()
+_marks: dict[str, float] = {}
+
+
+def mark(name: str):
+    """Record, once, how long after app.main started importing ``name`` happened."""
+    _marks.setdefault(name, round(time.perf_counter() - _started, 4))
+
+
+def startup_report() -> dict:
+    return {"mode": MODE, "seconds": dict(_marks)}
+
+
+class FirstRequestTimer:
+    """ASGI middleware that marks the end of the first HTTP request, then steps aside."""
+
+    def __init__(self, app):
+        self.app = app
+        self.done = False
+
+    async def __call__(self, scope, receive, send):
+        if self.done or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if not self.done:
+                self.done = True
+                mark("first_request")
+                log.info("startup timing: %s", startup_report())
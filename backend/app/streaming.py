@@ -0,0 +1,35 @@
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from .database import SessionLocal
+
+NDJSON = "application/x-ndjson"
+STREAM_BATCH = 1000
+
+
+def wants_stream(request: Request, stream: bool) -> bool:
+    return stream or NDJSON in request.headers.get("accept", "")
+
+
+def ndjson_response(stmt: Select, response: Response, batch: int = STREAM_BATCH) -> StreamingResponse:
+    """Stream ``stmt`` as one JSON object per line from a server-side cursor.
+
+    The generator opens its own session: the request's get_db session is
+    closed before the response body starts streaming. Headers that
+    dependencies set on the injected ``response`` are carried over, as in
+    fast_json.
+    """
+    def generate():
+        db = SessionLocal()
+        try:
+            result = db.connection().execute(stmt.execution_options(yield_per=batch))
+            for rows in result.mappings().partitions():
+                yield b"".join(orjson.dumps(dict(row)) + b"\n" for row in rows)
+        finally:
+            db.close()
+
+    out = StreamingResponse(generate(), media_type=NDJSON)
+    out.raw_headers.extend(response.headers.raw)
+    return out
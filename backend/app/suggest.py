@@ -0,0 +1,225 @@
+import bisect
+import heapq
+import logging
+import os
+import sys
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .models import Application, CatalogVersion, DbColumn, DbTable
+
+log = logging.getLogger(__name__)
+
+ENABLED = os.getenv("SUGGEST_INDEX", "0") == "1"
+FUZZY_MIN_SCORE = 0.3
+# Keys of the prefix range scored per lookup. The range is in key order, not
+# score order, so it is scanned well past k: "orders" sorts after every
+# "order_*" key but outranks them.
+PREFIX_CANDIDATES = int(os.getenv("SUGGEST_PREFIX_CANDIDATES", "5000"))
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SuggestIndex:
+    """Prefix and trigram lookup over application, table and column names.
+
+    Entries are (type, id, display name). Each entry is reachable from one or
+    more lower-cased keys kept in a sorted list for prefix lookups, and its
+    display name is split into trigram postings for fuzzy lookups.
+    """
+
+    def __init__(self):
+        self.version: int | None = None
+        self.built_at: float | None = None
+        self.build_seconds: float | None = None
+        self._lock = threading.RLock()
+        self._building = False
+        self._entries: dict[tuple[str, int], str] = {}
+        self._keys: list[tuple[str, str, int]] = []
+        self._postings: dict[str, set[tuple[str, int]]] = {}
+
+    @staticmethod
+    def _entry_keys(kind: str, name: str) -> list[str]:
+        key = name.lower()
+        parts = key.split(".")
+        # "schema.table" and "schema.table.column" are also reachable by their last part.
+        return [key, parts[-1]] if len(parts) > 1 else [key]
+
+    def _add(self, kind: str, entry_id: int, name: str):
+        ref = (kind, entry_id)
+        if ref in self._entries:
+            self._remove(kind, entry_id)
+        self._entries[ref] = name
+        for key in self._entry_keys(kind, name):
+            bisect.insort(self._keys, (key, kind, entry_id))
+        for gram in _trigrams(name.split(".")[-1].lower()):
+            self._postings.setdefault(gram, set()).add(ref)
+
+    def _remove(self, kind: str, entry_id: int):
+        name = self._entries.pop((kind, entry_id), None)
+        if name is None:
+            return
+        for key in self._entry_keys(kind, name):
+            i = bisect.bisect_left(self._keys, (key, kind, entry_id))
+            if i < len(self._keys) and self._keys[i] == (key, kind, entry_id):
+                del self._keys[i]
+        for gram in _trigrams(name.split(".")[-1].lower()):
+            refs = self._postings.get(gram)
+            if refs is not None:
+                refs.discard((kind, entry_id))
+                if not refs:
+                    del self._postings[gram]
+
+    def load(self, version: int, entries: list[tuple[str, int, str]]):
+        index = SuggestIndex()
+        for kind, entry_id, name in entries:
+            ref = (kind, entry_id)
+            index._entries[ref] = name
+            for key in self._entry_keys(kind, name):
+                index._keys.append((key, kind, entry_id))
+            for gram in _trigrams(name.split(".")[-1].lower()):
+                index._postings.setdefault(gram, set()).add(ref)
+        index._keys.sort()
+        with self._lock:
+            self._entries, self._keys, self._postings = index._entries, index._keys, index._postings
+            self.version = version
+            self.built_at = time.time()
+
+    def apply(
+        self,
+        version: int | None,
+        added: list[tuple[str, int, str]] = (),
+        removed: list[tuple[str, int]] = (),
+    ):
+        """Write-through from a committed transaction that produced ``version``.
+
+        Changes are applied in place only if they directly follow the version
+        the index reflects; otherwise another instance has written in between
+        and the index is marked stale so the next lookup rebuilds it.
+        """
+        with self._lock:
+            if self.version is None or version is None or version != self.version + 1:
+                self.version = None
+                return
+            for kind, entry_id in removed:
+                self._remove(kind, entry_id)
+            for kind, entry_id, name in added:
+                self._add(kind, entry_id, name)
+            self.version = version
+
+    def suggest(self, q: str, k: int = 10, types: set[str] | None = None) -> list[dict]:
+        q = q.strip().lower()
+        if not q:
+            return []
+        results: dict[tuple[str, int], float] = {}
+        with self._lock:
+            i = bisect.bisect_left(self._keys, (q, "", 0))
+            end = min(i + PREFIX_CANDIDATES, len(self._keys))
+            while i < end:
+                key, kind, entry_id = self._keys[i]
+                if not key.startswith(q):
+                    break
+                i += 1
+                if types and kind not in types:
+                    continue
+                score = 2.0 if key == q else 1.0 + len(q) / len(key)
+                ref = (kind, entry_id)
+                results[ref] = max(score, results.get(ref, 0.0))
+
+            if len(results) < k and len(q) >= 3:
+                # Candidates come from the rarer half of the query trigrams so a
+                # common gram such as "_id" cannot pull in most of the catalog;
+                # they are then scored against all of the query's trigrams.
+                postings = sorted(
+                    (self._postings.get(gram, set()) for gram in _trigrams(q)), key=len,
+                )
+                candidates = set().union(*postings[:max(1, len(postings) // 2)])
+                for ref in candidates:
+                    if ref in results or (types and ref[0] not in types):
+                        continue
+                    shared = sum(ref in refs for refs in postings)
+                    # A padded name of length n has about n + 1 distinct trigrams.
+                    target_grams = len(self._entries[ref].rsplit(".", 1)[-1]) + 1
+                    score = shared / (len(postings) + target_grams - shared)
+                    if score >= FUZZY_MIN_SCORE:
+                        results[ref] = score
+
+            ranked = heapq.nsmallest(k, results.items(), key=lambda item: (-item[1], self._entries[item[0]]))
+            return [
+                {"type": kind, "id": entry_id, "name": self._entries[(kind, entry_id)], "score": round(score, 4)}
+                for (kind, entry_id), score in ranked
+            ]
+
+    def stats(self) -> dict:
+        with self._lock:
+            entry_bytes = sys.getsizeof(self._entries) + sum(
+                sys.getsizeof(ref) + sys.getsizeof(name) for ref, name in self._entries.items()
+            )
+            key_bytes = sys.getsizeof(self._keys) + sum(
+                sys.getsizeof(item) + sys.getsizeof(item[0]) for item in self._keys
+            )
+            posting_bytes = sys.getsizeof(self._postings) + sum(
+                sys.getsizeof(gram) + sys.getsizeof(refs) for gram, refs in self._postings.items()
+            )
+            total = entry_bytes + key_bytes + posting_bytes
+            count = len(self._entries)
+            return {
+                "enabled": ENABLED,
+                "version": self.version,
+                "building": self._building,
+                "built_at": self.built_at,
+                "build_seconds": self.build_seconds,
+                "entries": count,
+                "keys": len(self._keys),
+                "trigrams": len(self._postings),
+                "bytes": total,
+                "bytes_per_100k_names": round(total * 100_000 / count) if count else None,
+            }
+
+    def rebuild(self, db: Session):
+        started = time.perf_counter()
+        # Read the version before the names so the names are never older than it.
+        version = db.scalar(select(CatalogVersion.version).where(CatalogVersion.id == 1)) or 0
+        entries = [("application", r.id, r.name) for r in db.execute(select(Application.id, Application.name))]
+        entries += [
+            ("table", r.id, f"{r.schema_name}.{r.table_name}")
+            for r in db.execute(select(DbTable.id, DbTable.schema_name, DbTable.table_name))
+        ]
+        entries += [
+            ("column", r.id, f"{r.schema_name}.{r.table_name}.{r.column_name}")
+            for r in db.execute(
+                select(DbColumn.id, DbColumn.column_name, DbTable.schema_name, DbTable.table_name)
+                .join(DbTable, DbColumn.table_id == DbTable.id)
+            )
+        ]
+        self.load(version, entries)
+        self.build_seconds = round(time.perf_counter() - started, 3)
+        log.info("suggest index: %d names at catalog version %s in %.2fs", len(entries), version, self.build_seconds)
+
+    def rebuild_in_background(self):
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+
+        def run():
+            db = SessionLocal()
+            try:
+                self.rebuild(db)
+            except Exception:
+                log.exception("suggest index rebuild failed")
+            finally:
+                db.close()
+                self._building = False
+
+        threading.Thread(target=run, name="suggest-index", daemon=True).start()
+
+
+suggest_index = SuggestIndex()
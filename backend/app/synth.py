@@ -0,0 +1,191 @@
+"""Synthetic catalog for local load tests.
+
+    python -m app.synth                      2k apps, 20k tables, 400k columns, 2M xrefs
+    python -m app.synth --scale 0.05         the same shape at 5%
+    python -m app.synth --replace --seed 7   truncate the catalog first; another draw
+
+Run it after `python -m app.migrate upgrade` against a local DATABASE_URL;
+rows are bulk-loaded with COPY, so it needs psycopg2. Usage is Zipf-like:
+a few applications and a few hot tables carry most of the xrefs and the
+long tail only a handful, as in the production catalog. The same arguments
+always produce the same catalog.
+"""
+import argparse
+import io
+import time
+
+import numpy as np
+
+SCHEMAS = [
+    "sales", "billing", "inventory", "shipping", "crm", "finance", "hr", "reporting", "audit", "staging",
+    "warehouse", "pricing", "claims", "policy", "ledger", "marketing", "support", "identity", "catalog", "ops",
+]
+WORDS = [
+    "account", "address", "agent", "batch", "branch", "carrier", "charge", "claim", "contract", "credit",
+    "customer", "delivery", "device", "discount", "employee", "event", "fee", "invoice", "item", "journal",
+    "ledger", "line", "location", "member", "note", "order", "party", "payment", "plan", "policy",
+    "price", "product", "quote", "rate", "receipt", "refund", "region", "request", "return", "route",
+    "schedule", "shipment", "sku", "statement", "stock", "supplier", "tax", "ticket", "transfer", "vendor",
+]
+COMMON_COLUMNS = [
+    "id", "created_at", "updated_at", "status", "name", "code", "description", "created_by", "updated_by",
+    "effective_date", "end_date", "amount", "currency", "quantity", "type_code", "source_system",
+]
+DATA_TYPES = {
+    "INTEGER": 0.26, "VARCHAR(255)": 0.22, "VARCHAR(40)": 0.1, "TIMESTAMP": 0.1, "DECIMAL(12,2)": 0.1,
+    "DATE": 0.08, "BIGINT": 0.06, "CHAR(1)": 0.05, "SMALLINT": 0.03,
+}
+USAGE_TYPES = {"READ": 0.6, "READ_WRITE": 0.25, "WRITE": 0.15}
+COPY_ROWS = 200_000
+NULL = "\\N"
+
+
+def zipf_weights(n: int, s: float, rng: np.random.Generator) -> np.ndarray:
+    """Probabilities falling off as 1/rank**s, shuffled so the hot ids are spread out."""
+    weights = 1.0 / np.arange(1, n + 1) ** s
+    return rng.permutation(weights / weights.sum())
+
+
+def _choice(rng: np.random.Generator, options: dict[str, float], size: int) -> list[str]:
+    names = list(options)
+    p = np.array(list(options.values()))
+    return [names[i] for i in rng.choice(len(names), size, p=p / p.sum()).tolist()]
+
+
+def generate(
+    apps: int, tables: int, columns: int, xrefs: int, zipf: float = 1.1, seed: int = 42,
+) -> dict[str, dict[str, list | np.ndarray]]:
+    """Column values of each catalog table, keyed by table and column name; ids start at 1."""
+    if not (apps >= 1 and tables >= 1 and columns >= tables):
+        raise ValueError("need at least one application and table, and a column for every table")
+    rng = np.random.default_rng(seed)
+    xrefs = min(xrefs, apps * columns)
+
+    app_words = rng.integers(0, len(WORDS), (apps, 2)).tolist()
+    app_rows = {
+        "id": np.arange(1, apps + 1),
+        "name": [f"{WORDS[a]}-{WORDS[b]}-svc-{i:05d}" for i, (a, b) in enumerate(app_words, 1)],
+        "description": [f"Synthetic application {i}" if i % 4 else NULL for i in range(1, apps + 1)],
+    }
+
+    schema_of = rng.choice(len(SCHEMAS), tables, p=zipf_weights(len(SCHEMAS), 1.0, rng)).tolist()
+    table_words = rng.integers(0, len(WORDS), (tables, 2)).tolist()
+    table_rows = {
+        "id": np.arange(1, tables + 1),
+        "schema_name": [SCHEMAS[s] for s in schema_of],
+        "table_name": [f"{WORDS[a]}_{WORDS[b]}_{i:06d}" for i, (a, b) in enumerate(table_words, 1)],
+        "description": [
+            f"Synthetic {WORDS[a]} {WORDS[b]} table" if i % 3 else NULL for i, (a, b) in enumerate(table_words, 1)
+        ],
+    }
+
+    # Widths are long-tailed: most tables are narrow, a few have hundreds of columns.
+    width = rng.lognormal(0.0, 1.0, tables)
+    sizes = 1 + rng.multinomial(columns - tables, width / width.sum())
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    table_of = np.repeat(np.arange(1, tables + 1), sizes)
+    ordinal = (np.arange(columns) - np.repeat(starts, sizes)).tolist()
+    column_words = rng.integers(0, len(WORDS), columns).tolist()
+    column_rows = {
+        "id": np.arange(1, columns + 1),
+        "table_id": table_of,
+        "column_name": [
+            COMMON_COLUMNS[k] if k < len(COMMON_COLUMNS) else f"{WORDS[w]}_{k}" for k, w in zip(ordinal, column_words)
+        ],
+        "data_type": _choice(rng, DATA_TYPES, columns),
+        "description": [
+            NULL if i % 5 else f"Synthetic column {k} of table {t}"
+            for i, (t, k) in enumerate(zip(table_of.tolist(), ordinal), 1)
+        ],
+    }
+
+    # An xref picks an application and a table by popularity, then a column of
+    # that table, so popular applications reuse the same hot tables.
+    app_p = zipf_weights(apps, zipf, rng)
+    table_p = zipf_weights(tables, zipf, rng) * sizes
+    table_p /= table_p.sum()
+    pairs = np.empty(0, dtype=np.int64)
+    while len(pairs) < xrefs:
+        n = int((xrefs - len(pairs)) * 1.3) + 1000
+        app = rng.choice(apps, n, p=app_p)
+        table = rng.choice(tables, n, p=table_p)
+        column = starts[table] + rng.integers(0, 1 << 31, n) % sizes[table]
+        pairs = np.unique(np.concatenate((pairs, app.astype(np.int64) * columns + column)))
+        if len(pairs) >= apps * columns:
+            break
+    pairs = rng.permutation(pairs)[:xrefs]
+    pairs.sort()
+    xref_rows = {
+        "id": np.arange(1, len(pairs) + 1),
+        "application_id": pairs // columns + 1,
+        "column_id": pairs % columns + 1,
+        "usage_type": _choice(rng, USAGE_TYPES, len(pairs)),
+    }
+
+    return {
+        "applications": app_rows,
+        "db_tables": table_rows,
+        "db_columns": column_rows,
+        "app_column_xref": xref_rows,
+    }
+
+
+def load(engine, catalog: dict[str, dict[str, list | np.ndarray]], replace: bool = False):
+    """COPY ``catalog`` into an empty catalog (or truncate it first with ``replace``)."""
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        if not hasattr(cur, "copy_expert"):
+            raise SystemExit("COPY loading needs psycopg2; point DATABASE_URL at a local database")
+        if replace:
+            cur.execute("TRUNCATE app_column_xref, db_columns, db_tables, applications RESTART IDENTITY")
+        else:
+            cur.execute("SELECT EXISTS (SELECT 1 FROM applications) OR EXISTS (SELECT 1 FROM db_tables)")
+            if cur.fetchone()[0]:
+                raise SystemExit("The catalog is not empty; pass --replace to truncate it first")
+
+        for table, values in catalog.items():
+            started = time.perf_counter()
+            rows = len(values["id"])
+            copy = f"COPY {table} ({', '.join(values)}) FROM STDIN"
+            for offset in range(0, rows, COPY_ROWS):
+                chunk = [list(map(str, v[offset:offset + COPY_ROWS])) for v in values.values()]
+                cur.copy_expert(copy, io.StringIO("".join("\t".join(row) + "\n" for row in zip(*chunk))))
+            cur.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), GREATEST(MAX(id), 1)) FROM {table}")
+            print(f"{table}: {rows} rows in {time.perf_counter() - started:.1f}s")
+        cur.execute("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
+        raw.commit()
+
+        started = time.perf_counter()
+        cur.execute("ANALYZE applications, db_tables, db_columns, app_column_xref")
+        raw.commit()
+        print(f"analyze: {time.perf_counter() - started:.1f}s")
+    finally:
+        raw.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.synth", description="Load a synthetic catalog")
+    parser.add_argument("--apps", type=int, default=2_000)
+    parser.add_argument("--tables", type=int, default=20_000)
+    parser.add_argument("--columns", type=int, default=400_000)
+    parser.add_argument("--xrefs", type=int, default=2_000_000)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every count by this factor")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Skew of application and table popularity")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--replace", action="store_true", help="Truncate the catalog tables first")
+    args = parser.parse_args()
+
+    counts = [max(1, round(n * args.scale)) for n in (args.apps, args.tables, args.columns, args.xrefs)]
+    started = time.perf_counter()
+    catalog = generate(*counts, zipf=args.zipf, seed=args.seed)
+    sizes = ", ".join(f"{len(values['id'])} {table}" for table, values in catalog.items())
+    print(f"generated {sizes} in {time.perf_counter() - started:.1f}s")
+
+    from .database import engine
+
+    load(engine, catalog, replace=args.replace)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+from app.profiling import count_queries
+
+
+def assert_max_queries(client, method: str, path: str, limit: int, **kwargs):
+    """Make one request through ``client`` and fail if it ran more than ``limit`` statements."""
+    with count_queries() as profile:
+        response = client.request(method, path, **kwargs)
+    assert response.status_code < 400, f"{method} {path}: {response.status_code} {response.text}"
+    assert profile.count <= limit, (
+        f"{method} {path} ran {profile.count} statements, limit {limit}:\n{profile.report()}"
+    )
+    return response
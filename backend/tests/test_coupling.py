@@ -0,0 +1,88 @@
+"""Coupling counts against a brute-force pair count; no database needed."""
+from collections import defaultdict
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from app import coupling
+from app.coupling import READ, WRITE, CouplingMatrix, coupling_counts
+
+
+def _brute_force(app_ids, column_ids, usage):
+    """{(a, b): (shared, write_write, read_read)} for a < b, pair by pair per column."""
+    by_column = defaultdict(list)
+    for app, column, flags in zip(app_ids, column_ids, usage):
+        by_column[column].append((app, flags))
+    counts = defaultdict(lambda: [0, 0, 0])
+    for users in by_column.values():
+        for (a, fa), (b, fb) in combinations(sorted(users), 2):
+            pair = counts[(a, b)]
+            pair[0] += 1
+            pair[1] += bool(fa & WRITE and fb & WRITE)
+            pair[2] += fa == READ and fb == READ
+    return {pair: tuple(c) for pair, c in counts.items()}
+
+
+def _counts(app_ids, column_ids, usage):
+    app_index, shared, ww, rr = coupling_counts(app_ids, column_ids, usage)
+    a, b = np.nonzero(np.triu(shared, 1))
+    return {
+        (int(app_index[i]), int(app_index[j])): (int(shared[i, j]), int(ww[i, j]), int(rr[i, j]))
+        for i, j in zip(a, b)
+    }
+
+
+def _xrefs(seed: int, apps: int = 40, columns: int = 300, wide: int = 3):
+    """Random xrefs, unique per (app, column), with a few columns used by most apps."""
+    rng = np.random.default_rng(seed)
+    incidence = rng.random((apps, columns)) < 0.08
+    incidence[:, :wide] = rng.random((apps, wide)) < 0.9
+    app_ids, column_ids = np.nonzero(incidence)
+    app_ids = app_ids * 3 + 7  # sparse, non-zero ids
+    usage = rng.choice([READ, WRITE, READ | WRITE], len(app_ids))
+    order = rng.permutation(len(app_ids))
+    return app_ids[order].astype(np.int64), column_ids[order].astype(np.int64), usage[order].astype(np.int64)
+
+
+# DENSE_MIN_APPS decides which columns are expanded into pairs and which are
+# multiplied as dense blocks; both paths, and their mix, must agree.
+@pytest.mark.parametrize("dense_min_apps", [2, 8, 30, 10**6])
+@pytest.mark.parametrize("pair_batch", [5, 4_000_000])
+@pytest.mark.parametrize("seed", [1, 2])
+def test_counts_match_brute_force(monkeypatch, dense_min_apps, pair_batch, seed):
+    monkeypatch.setattr(coupling, "DENSE_MIN_APPS", dense_min_apps)
+    monkeypatch.setattr(coupling, "PAIR_BATCH", pair_batch)
+    monkeypatch.setattr(coupling, "DENSE_CHUNK", 7)
+    xrefs = _xrefs(seed)
+    assert _counts(*xrefs) == _brute_force(*xrefs)
+
+
+def test_no_xrefs():
+    empty = np.empty(0, np.int64)
+    assert _counts(empty, empty, empty) == {}
+
+
+def test_ranked():
+    # Column 10: app 1 writes, app 2 reads. Column 11: apps 1 and 2 read, app 3 writes.
+    matrix = CouplingMatrix()
+    matrix.load(
+        1,
+        np.array([1, 2, 1, 2, 3]),
+        np.array([10, 10, 11, 11, 11]),
+        np.array([WRITE, READ, READ, READ, WRITE]),
+        {1: "one", 2: "two", 3: "three"},
+    )
+
+    total, pairs = matrix.ranked()
+    assert total == 3
+    assert [(p["application_id"], p["other_application_id"], p["score"]) for p in pairs] == [
+        (1, 2, 3.0), (1, 3, 2.0), (2, 3, 2.0),
+    ]
+    assert (pairs[0]["shared_columns"], pairs[0]["read_read"], pairs[0]["read_write"]) == (2, 1, 1)
+
+    total, pairs = matrix.ranked(application_id=3, limit=1)
+    assert total == 2
+    assert [(p["application_id"], p["other_application_name"]) for p in pairs] == [(3, "one")]
+
+    assert matrix.ranked(min_shared=2)[0] == 1
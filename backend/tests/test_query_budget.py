@@ -0,0 +1,99 @@
+"""Statement budgets for the hot endpoints.
+
+Each budget is what the endpoint issues today on the seeded catalog, with the
+catalog version read cold. A new per-row query (N+1) or an extra round trip
+fails here; if a change needs one on purpose, raise the budget with it.
+"""
+import pytest
+
+from app import catalog_version
+from app.profiling import count_queries
+from support import assert_max_queries
+
+
+@pytest.fixture(autouse=True)
+def cold_catalog_version():
+    # The version is cached for a few seconds; re-read it in every request
+    # so the counts do not depend on test order or timing.
+    catalog_version._version = None
+
+
+READS = [
+    ("/api/applications", 3),
+    ("/api/applications/1", 3),
+    ("/api/applications/batch?ids=1,2,3,4,5", 3),
+    ("/api/tables", 3),
+    ("/api/tables/1", 3),
+    ("/api/tables/batch?ids=1,2,3,4,5,6", 2),
+    ("/api/tables/batch?ids=1,2,3,4,5,6&include=apps", 4),
+    ("/api/columns", 3),
+    ("/api/columns/1", 3),
+    ("/api/columns/batch?ids=1,2,3,4,5,6,7,8", 3),
+    ("/api/xref/by-app/1", 2),
+    ("/api/xref/by-column/1", 2),
+    ("/api/search?q=order", 2),
+    ("/api/analytics/impact?table_id=1", 3),
+    ("/api/analytics/coupling", 4),
+    ("/api/catalog/fingerprints?schema_name=public", 2),
+]
+
+
+@pytest.mark.parametrize("path, limit", READS)
+def test_read_budget(client, path, limit):
+    assert_max_queries(client, "GET", path, limit)
+
+
+def _columns(prefix: str, n: int) -> list[dict]:
+    return [{"column_name": f"{prefix}_{i}", "data_type": "INTEGER"} for i in range(n)]
+
+
+def test_create_columns_budget(client):
+    assert_max_queries(client, "POST", "/api/tables/1/columns", 3, json=_columns("budget", 5))
+
+
+def test_create_xref_budget(client):
+    table = client.post("/api/tables", json={"schema_name": "budget", "table_name": "xref_target"}).json()
+    column = client.post(f"/api/tables/{table['id']}/columns", json=_columns("target", 1)).json()[0]
+    assert_max_queries(
+        client, "POST", "/api/xref", 3, json={"application_id": 1, "column_id": column["id"], "usage_type": "READ"},
+    )
+
+
+def test_replace_xrefs_budget(client):
+    xrefs = [{"column_id": i, "usage_type": "READ"} for i in range(1, 9)]
+    assert_max_queries(client, "PUT", "/api/xref/by-app/2", 6, json={"xrefs": xrefs})
+
+
+def _ingest(schema: str, tables: int) -> dict:
+    return {
+        "schemas": [{
+            "schema_name": schema,
+            "tables": [{"table_name": f"t{i}", "columns": _columns("c", 5)} for i in range(tables)],
+        }],
+        "xrefs": [
+            {"application_name": "OrderService", "schema_name": schema, "table_name": f"t{i}",
+             "column_name": "c_1", "usage_type": "READ"}
+            for i in range(tables)
+        ],
+    }
+
+
+def test_ingest_budget(client):
+    assert_max_queries(client, "POST", "/api/catalog/ingest", 9, json=_ingest("budget_ingest", 10))
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("POST", "/api/tables/{table_id}/columns", lambda n: _columns(f"scale_{n}", n)),
+    ("POST", "/api/catalog/ingest", lambda n: _ingest(f"scale_{n}", n)),
+])
+def test_writes_do_not_scale_with_rows(client, method, path, body):
+    table = client.post("/api/tables", json={"schema_name": "budget", "table_name": f"scale_{method}_{len(path)}"})
+    counts = []
+    for n in (2, 40):
+        catalog_version._version = None
+        with count_queries() as profile:
+            response = client.request(method, path.format(table_id=table.json()["id"]), json=body(n))
+        assert response.status_code < 400, response.text
+        counts.append(profile)
+    small, large = counts
+    assert large.count == small.count, f"2 rows: {small.report()}\n40 rows: {large.report()}"
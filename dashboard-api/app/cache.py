@@ -0,0 +1,249 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import orjson
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.compression import COMPRESS_MIN_BYTES, compress, negotiate
+
+# PMOpt replaces the whole schema on publish, so the newest publish_metadata
+# row identifies the data. Commitments are maintained by hand outside of
+# publishes; their row count and newest xmin are folded into the version so a
+# manual insert/update/delete invalidates the cache as well.
+VERSION_SQL = text("""
+    SELECT
+        (SELECT MAX(id) FROM pmopt.publish_metadata)           AS publish_id,
+        (SELECT MAX(published_at) FROM pmopt.publish_metadata) AS published_at,
+        (SELECT COUNT(*) || ':' || COALESCE(MAX(xmin::text::bigint), 0)
+           FROM pmopt.commitments)                             AS commitments_rev
+""")
+
+
+class Entry:
+    """One encoded payload plus its compressed forms, made on first request."""
+
+    __slots__ = ("body", "encoded")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.encoded: dict[str, bytes] = {}
+
+    def get(self, encoding: str | None) -> bytes:
+        if encoding is None:
+            return self.body
+        body = self.encoded.get(encoding)
+        if body is None:
+            body = self.encoded[encoding] = compress(self.body, encoding)
+        return body
+
+    def __len__(self) -> int:
+        return len(self.body) + sum(map(len, self.encoded.values()))
+
+
+class PublishCache:
+    """In-process cache of encoded JSON responses, valid for one publish.
+
+    Entries are compressed once per encoding and kept, so a hit costs neither
+    serialization nor compression.
+
+    Version probes and rebuilds are single-flight: concurrent requests that
+    find the version due, or the same entry missing, wait for the one request
+    already doing the work instead of repeating its query.
+    """
+
+    def __init__(self, max_projects: int = 256, check_seconds: float = 5.0, max_variants: int = 128):
+        self.max_projects = max_projects
+        self.max_variants = max_variants
+        self.check_seconds = check_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._version: tuple | None = None
+        self._checked_at = 0.0
+        self._shared: dict[str, Entry] = {}
+        self._projects: OrderedDict[tuple[str, str], Entry] = OrderedDict()
+        self._variants: OrderedDict[tuple[str, str], Entry] = OrderedDict()
+        self._version_lock = asyncio.Lock()
+        self._build_locks: dict[tuple[str, str | None, str | None], asyncio.Lock] = {}
+
+    def _fresh(self) -> bool:
+        return self._version is not None and time.monotonic() - self._checked_at < self.check_seconds
+
+    async def version(self, db: AsyncSession) -> tuple | None:
+        if self._fresh():
+            return self._version
+        async with self._version_lock:
+            if self._fresh():
+                return self._version
+            now = time.monotonic()
+            try:
+                row = (await db.execute(VERSION_SQL)).first()
+            except SQLAlchemyError:
+                await db.rollback()
+                return None
+            self.set_version(tuple(row), now)
+            return self._version
+
+    def set_version(self, version: tuple, checked_at: float | None = None):
+        with self._lock:
+            if version != self._version:
+                self._shared.clear()
+                self._projects.clear()
+                self._variants.clear()
+                self._version = version
+            self._checked_at = time.monotonic() if checked_at is None else checked_at
+
+    def _slot(self, key: str, project_id: str | None, variant: str | None):
+        """(store, store key, LRU size or None when unbounded) for one entry."""
+        if variant is not None:
+            return self._variants, (key, variant), self.max_variants
+        if project_id is not None:
+            return self._projects, (key, project_id), self.max_projects
+        return self._shared, key, None
+
+    def _lookup(self, key: str, project_id: str | None, variant: str | None = None) -> Entry | None:
+        store, slot, limit = self._slot(key, project_id, variant)
+        entry = store.get(slot)
+        if entry is not None and limit is not None:
+            store.move_to_end(slot)
+        return entry
+
+    def get(self, key: str, project_id: str | None = None, variant: str | None = None) -> Entry | None:
+        with self._lock:
+            entry = self._lookup(key, project_id, variant)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def put(
+        self, version: tuple, key: str, entry: Entry, project_id: str | None = None, variant: str | None = None,
+    ):
+        with self._lock:
+            if version != self._version:
+                return  # a publish landed while this payload was being built
+            store, slot, limit = self._slot(key, project_id, variant)
+            if limit is None:
+                store[slot] = entry
+                return
+            if limit <= 0:
+                return
+            store[slot] = entry
+            store.move_to_end(slot)
+            while len(store) > limit:
+                store.popitem(last=False)
+                self.evictions += 1
+
+    async def get_or_build(
+        self, version: tuple, key: str, build, project_id: str | None = None, variant: str | None = None,
+    ) -> Entry:
+        if len(self._build_locks) > 4 * (self.max_projects + self.max_variants) + 16:
+            self._build_locks.clear()  # unknown project ids must not grow this forever
+        lock = self._build_locks.setdefault((key, project_id, variant), asyncio.Lock())
+        async with lock:
+            with self._lock:
+                entry = self._lookup(key, project_id, variant)
+            if entry is None:
+                entry = Entry(encode(await build()))
+                self.put(version, key, entry, project_id, variant)
+            return entry
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "version": {
+                    "publish_id": self._version[0],
+                    "published_at": self._version[1].isoformat() if self._version[1] else None,
+                    "commitments_rev": self._version[2],
+                } if self._version else None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "shared_entries": len(self._shared),
+                "project_entries": len(self._projects),
+                "max_projects": self.max_projects,
+                "variant_entries": len(self._variants),
+                "max_variants": self.max_variants,
+                "bytes": sum(
+                    sum(map(len, store.values())) for store in (self._shared, self._projects, self._variants)
+                ),
+            }
+
+
+publish_cache = PublishCache(
+    max_projects=int(os.getenv("DASHBOARD_CACHE_MAX_PROJECTS", "256")),
+    check_seconds=float(os.getenv("DASHBOARD_CACHE_CHECK_SECONDS", "5")),
+    max_variants=int(os.getenv("DASHBOARD_CACHE_MAX_VARIANTS", "128")),
+)
+
+
+def encode(payload) -> bytes:
+    """Payloads already encoded by the database are passed through as is.
+
+    orjson writes dates and datetimes in ISO format, so builders hand them over
+    as they come from the driver.
+    """
+    return payload if isinstance(payload, bytes) else orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def publish_etag(version: tuple, key: str, project_id: str | None = None, variant: str | None = None) -> str:
+    digest = hashlib.sha1(repr((version, key, project_id, variant)).encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+async def cached_json(
+    request: Request, db: AsyncSession, key: str, build,
+    project_id: str | None = None, variant: str | None = None,
+) -> Response:
+    """``build`` is an async callable returning the JSON-able payload or JSON bytes.
+
+    ``variant`` identifies a filtered form of ``key`` (its canonical query);
+    those are kept in their own bounded LRU so ad-hoc filters cannot push the
+    shared payloads out.
+    """
+    version = await publish_cache.version(db)
+    if version is None:
+        return Response(encode(await build()), media_type="application/json")  # the middleware compresses it
+
+    headers = {"ETag": publish_etag(version, key, project_id, variant), "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, headers["ETag"]):
+        if "W/" + headers["ETag"] in if_none_match:
+            headers["ETag"] = "W/" + headers["ETag"]  # the client holds an encoded copy (see _send)
+        return Response(status_code=304, headers=headers)
+
+    entry = publish_cache.get(key, project_id, variant)
+    if entry is not None:
+        return _send(request, entry, {**headers, "X-Cache": "HIT"})
+
+    entry = await publish_cache.get_or_build(version, key, build, project_id, variant)
+    return _send(request, entry, {**headers, "X-Cache": "MISS"})
+
+
+def _send(request: Request, entry: Entry, headers: dict) -> Response:
+    encoding = None
+    if COMPRESS_MIN_BYTES > 0:
+        headers["Vary"] = "Accept-Encoding"
+        if len(entry.body) >= COMPRESS_MIN_BYTES:
+            encoding = negotiate(request.headers.get("accept-encoding", ""))
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+        headers["ETag"] = "W/" + headers["ETag"]  # equivalent to, not the same bytes as, the identity body
+    return Response(entry.get(encoding), media_type="application/json", headers=headers)
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import date
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+log = logging.getLogger(__name__)
+
+# Task hours are spread evenly over the task's working days and expressed as
+# full-time people, the unit of resources.total_count and commitments.resource_count.
+HOURS_PER_DAY = float(os.getenv("DASHBOARD_HOURS_PER_DAY", "8"))
+
+TASKS_SQL = text("""
+    SELECT resource_type, start_date, end_date,
+           COALESCE(remaining_hours, estimated_duration) AS hours
+    FROM pmopt.tasks
+    WHERE status IS DISTINCT FROM 'completed'
+      AND resource_type IS NOT NULL
+      AND start_date IS NOT NULL AND end_date IS NOT NULL
+      AND COALESCE(remaining_hours, estimated_duration, 0) > 0
+""")
+
+COMMITMENTS_SQL = text("""
+    SELECT resource_type, start_date, end_date, resource_count
+    FROM pmopt.commitments
+""")
+
+RESOURCES_SQL = text("SELECT resource_type, total_count FROM pmopt.resources")
+
+
+def _dates(values) -> np.ndarray:
+    return np.array(values, dtype="datetime64[D]").reshape(-1)
+
+
+def _spans(origin, starts, ends):
+    """Business-day index ranges [first, last) covering each inclusive date range."""
+    # Starts are rolled to a working day first: busday_count back from the
+    # origin to a weekend just before it would give -1.
+    first = np.busday_count(origin, np.busday_offset(starts, 0, roll="forward"))
+    last = np.busday_count(origin, ends + np.timedelta64(1, "D"))
+    # A range falling entirely on a weekend counts against the next working day.
+    return first, np.maximum(last, first + 1)
+
+
+def _daily(type_codes, first, last, per_day, n_types, n_days) -> np.ndarray:
+    """(types x days) sum of ``per_day`` over every [first, last) range, via a difference array."""
+    width = n_days + 1
+    size = n_types * width
+    diff = np.bincount(type_codes * width + first, per_day, size) - np.bincount(type_codes * width + last, per_day, size)
+    return np.cumsum(diff.reshape(n_types, width), axis=1)[:, :n_days]
+
+
+def _weeks(days: np.ndarray) -> np.ndarray:
+    """Start offsets of each Monday-to-Friday week within the business ``days``."""
+    monday = days - (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    return np.flatnonzero(np.concatenate(([True], monday[1:] != monday[:-1])))
+
+
+def _runs(over: np.ndarray):
+    """(row, start, stop) of every run of True along the rows of ``over``."""
+    edges = np.diff(np.pad(over.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, stops = np.nonzero(edges == -1)
+    return rows, starts, stops
+
+
+class CapacityModel:
+    """Daily demand and capacity per resource type, at one publish.
+
+    Built once per publish as (resource types x business days) arrays so a
+    request only slices a window and aggregates it.
+    """
+
+    def __init__(self):
+        self.version: tuple | None = None
+        self.build_seconds: float | None = None
+        self.types: list[str] = []
+        self.capacity = np.empty(0)
+        self.days = np.empty(0, "datetime64[D]")
+        self.demand = self.committed = np.empty((0, 0))
+        self._lock = asyncio.Lock()
+
+    async def ensure(self, db: AsyncSession, version: tuple | None):
+        async with self._lock:
+            if version is None or self.version != version:
+                await self.rebuild(db, version)
+
+    async def rebuild(self, db: AsyncSession, version: tuple | None):
+        tasks = (await db.execute(TASKS_SQL)).all()
+        commitments = (await db.execute(COMMITMENTS_SQL)).all()
+        resources = dict((await db.execute(RESOURCES_SQL)).all())
+        task_cols = list(zip(*tasks)) or [(), (), (), ()]
+        commit_cols = list(zip(*commitments)) or [(), (), (), ()]
+        self.load(
+            version,
+            np.array(task_cols[0], dtype=object), _dates(task_cols[1]), _dates(task_cols[2]),
+            np.array(task_cols[3], dtype=np.float64),
+            np.array(commit_cols[0], dtype=object), _dates(commit_cols[1]), _dates(commit_cols[2]),
+            np.array(commit_cols[3], dtype=np.float64),
+            resources,
+        )
+        log.info(
+            "capacity model: %d tasks, %d commitments, %d days in %.3fs",
+            len(tasks), len(commitments), len(self.days), self.build_seconds,
+        )
+
+    def load(
+        self, version, task_types, task_starts, task_ends, task_hours,
+        commit_types, commit_starts, commit_ends, commit_counts, resources: dict[str, int],
+    ):
+        started = time.perf_counter()
+        names, codes = np.unique(
+            np.concatenate((np.array(list(resources), dtype=object), task_types, commit_types)).astype(str),
+            return_inverse=True,
+        )
+        n_resources, n_tasks = len(resources), len(task_types)
+        task_codes, commit_codes = codes[n_resources:n_resources + n_tasks], codes[n_resources + n_tasks:]
+        capacity = np.zeros(len(names))
+        capacity[codes[:n_resources]] = list(resources.values())
+
+        all_starts = np.concatenate((task_starts, commit_starts))
+        if len(all_starts):
+            origin = np.busday_offset(all_starts.min(), 0, roll="forward")
+            task_first, task_last = _spans(origin, task_starts, task_ends)
+            commit_first, commit_last = _spans(origin, commit_starts, commit_ends)
+            n_days = int(max(task_last.max(initial=0), commit_last.max(initial=0)))
+            days = np.busday_offset(origin, np.arange(n_days), roll="forward")
+            per_day = task_hours / (HOURS_PER_DAY * (task_last - task_first))
+            committed = _daily(commit_codes, commit_first, commit_last, commit_counts, len(names), n_days)
+            demand = _daily(task_codes, task_first, task_last, per_day, len(names), n_days) + committed
+        else:
+            days = np.empty(0, "datetime64[D]")
+            demand = committed = np.zeros((len(names), 0))
+
+        self.types, self.capacity, self.days = names.tolist(), capacity, days
+        self.demand, self.committed = demand, committed
+        self.version = version
+        self.build_seconds = round(time.perf_counter() - started, 4)
+
+    def timeline(
+        self,
+        resource_types: list[str] | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        granularity: str = "week",
+    ) -> list[dict]:
+        rows = np.arange(len(self.types))
+        if resource_types:
+            wanted = set(resource_types)
+            rows = np.array([i for i, name in enumerate(self.types) if name in wanted], dtype=np.int64)
+        lo = 0 if date_from is None else int(np.searchsorted(self.days, np.datetime64(date_from, "D")))
+        hi = len(self.days) if date_to is None else int(np.searchsorted(self.days, np.datetime64(date_to, "D"), "right"))
+        days = self.days[lo:hi]
+        demand, committed = self.demand[rows, lo:hi], self.committed[rows, lo:hi]
+        capacity = self.capacity[rows]
+
+        if granularity == "week" and len(days):
+            bounds = _weeks(days)
+            width = np.diff(np.append(bounds, len(days)))
+            starts = days[bounds]
+            load = np.add.reduceat(demand, bounds, axis=1) / width
+            commit = np.add.reduceat(committed, bounds, axis=1) / width
+            peak = np.maximum.reduceat(demand, bounds, axis=1)
+        else:
+            starts, load, commit, peak = days, demand, committed, demand
+        labels = np.datetime_as_string(starts).tolist()
+        load, commit, peak = np.round(load, 2).tolist(), np.round(commit, 2).tolist(), np.round(peak, 2).tolist()
+
+        # Over-allocation is always found at daily resolution.
+        excess = demand - capacity[:, None]
+        run_rows, run_starts, run_stops = _runs(excess > 1e-9)
+        n_days = demand.shape[1]
+        bounds = np.column_stack((run_rows * n_days + run_starts, run_rows * n_days + run_stops)).ravel()
+        run_peak = np.maximum.reduceat(np.append(demand.ravel(), 0), bounds)[::2] if len(bounds) else bounds
+        cumulative = np.cumsum(np.pad(np.clip(excess, 0, None), ((0, 0), (1, 0))), axis=1)
+        run_excess = cumulative[run_rows, run_stops] - cumulative[run_rows, run_starts]
+        periods = [[] for _ in rows]
+        for i, r in enumerate(run_rows.tolist()):
+            a, b = int(run_starts[i]), int(run_stops[i])
+            periods[r].append({
+                "start_date": str(days[a]),
+                "end_date": str(days[b - 1]),
+                "days": b - a,
+                "peak_demand": round(float(run_peak[i]), 2),
+                "excess_days": round(float(run_excess[i]), 2),
+            })
+
+        return [
+            {
+                "resource_type": self.types[row],
+                "capacity": float(capacity[i]),
+                "periods": [
+                    {"start_date": labels[j], "demand": load[i][j], "committed": commit[i][j], "peak": peak[i][j]}
+                    for j in range(len(labels))
+                ],
+                "over_allocated": periods[i],
+            }
+            for i, row in enumerate(rows.tolist())
+        ]
+
+
+capacity_model = CapacityModel()
@@ -0,0 +1,213 @@
+from sqlalchemy import text
+
+# Critical path method over the published task dependencies. Durations are
+# remaining work hours (zero once a task is completed), so earliest/latest
+# start and finish are work hours from now. Everything is linear in tasks plus
+# prerequisite edges: Kahn's algorithm orders the graph, and what it cannot
+# order lies on, or behind, a cycle.
+
+EPSILON = 1e-9
+
+TASKS_SQL = """
+    SELECT
+        t.project_id,
+        t.task_id,
+        t.task_description,
+        t.status,
+        t.drop_number,
+        t.end_date,
+        CASE WHEN t.status = 'completed' THEN 0
+             ELSE COALESCE(t.remaining_hours, t.estimated_duration, 0) END AS duration,
+        CASE WHEN jsonb_typeof(t.prerequisite_task_ids) = 'array'
+             THEN ARRAY(SELECT jsonb_array_elements_text(t.prerequisite_task_ids))
+             ELSE '{{}}'::text[] END AS prerequisites
+    FROM pmopt.tasks t
+    JOIN pmopt.projects p ON p.project_id = t.project_id
+    WHERE {where}
+    ORDER BY t.project_id, t.task_id
+"""
+
+MILESTONES_SQL = """
+    SELECT
+        m.milestone_id,
+        m.project_id,
+        m.name,
+        m.target_date,
+        m.constraint_type,
+        m.status,
+        CASE WHEN jsonb_typeof(m.linked_task_ids) = 'array'
+             THEN ARRAY(SELECT jsonb_array_elements_text(m.linked_task_ids))
+             ELSE '{{}}'::text[] END AS linked_task_ids,
+        CASE WHEN jsonb_typeof(m.linked_drops) = 'array'
+             THEN ARRAY(SELECT jsonb_array_elements_text(m.linked_drops))
+             ELSE '{{}}'::text[] END AS linked_drops
+    FROM pmopt.milestones m
+    JOIN pmopt.projects p ON p.project_id = m.project_id
+    WHERE {where}
+    ORDER BY m.project_id, m.target_date, m.milestone_id
+"""
+
+
+def queries(where: str):
+    return text(TASKS_SQL.format(where=where)), text(MILESTONES_SQL.format(where=where))
+
+
+def _order(n: int, preds: list[list[int]], succs: list[list[int]]):
+    """Kahn's topological order, plus the tasks that sit on a cycle."""
+    indegree = [len(p) for p in preds]
+    order = [i for i in range(n) if not indegree[i]]
+    for i in order:  # appending while iterating walks the queue
+        for s in succs[i]:
+            indegree[s] -= 1
+            if not indegree[s]:
+                order.append(s)
+    if len(order) == n:
+        return order, []
+    # What Kahn left over is cycles plus everything downstream of them; peel
+    # the downstream tasks off from the sink side to keep only the cycles.
+    left = set(range(n)).difference(order)
+    outdegree = {i: sum(s in left for s in succs[i]) for i in left}
+    sinks = [i for i, d in outdegree.items() if not d]
+    for i in sinks:
+        left.discard(i)
+        for p in preds[i]:
+            if p in left:
+                outdegree[p] -= 1
+                if not outdegree[p]:
+                    sinks.append(p)
+    return order, sorted(left)
+
+
+def schedule(tasks: list, milestones: list) -> dict:
+    """Critical path analysis of one project's task rows and milestone rows."""
+    n = len(tasks)
+    ids = [t["task_id"] for t in tasks]
+    index = {task_id: i for i, task_id in enumerate(ids)}
+    duration = [float(t["duration"] or 0) for t in tasks]
+    preds: list[list[int]] = [[] for _ in range(n)]
+    succs: list[list[int]] = [[] for _ in range(n)]
+    missing = []
+    lookup = index.get
+    for i, t in enumerate(tasks):
+        prerequisites = t["prerequisites"]
+        if not prerequisites:
+            continue
+        for prerequisite in dict.fromkeys(prerequisites):
+            j = lookup(prerequisite)
+            if j is None:
+                missing.append({"task_id": ids[i], "prerequisite": prerequisite})
+            else:
+                preds[i].append(j)
+                succs[j].append(i)
+
+    order, cycle = _order(n, preds, succs)
+    earliest = [0.0] * n
+    for i in order:
+        finish = earliest[i] + duration[i]
+        for s in succs[i]:
+            if finish > earliest[s]:
+                earliest[s] = finish
+    end = max((earliest[i] + duration[i] for i in order), default=0.0)
+    latest = [end] * n  # latest finish
+    for i in reversed(order):
+        start = latest[i] - duration[i]
+        for p in preds[i]:
+            if start < latest[p]:
+                latest[p] = start
+    scheduled = [False] * n
+    for i in order:
+        scheduled[i] = True
+    slack = [latest[i] - duration[i] - earliest[i] for i in range(n)]
+    critical = [scheduled[i] and slack[i] <= EPSILON for i in range(n)]
+
+    chain = []
+    last = max((i for i in order if critical[i]), key=lambda i: earliest[i] + duration[i], default=None)
+    while last is not None:
+        chain.append(last)
+        last = next(
+            (p for p in preds[last] if critical[p] and abs(earliest[p] + duration[p] - earliest[last]) <= EPSILON),
+            None,
+        )
+    chain.reverse()
+
+    by_drop: dict[str, list[int]] = {}
+    if milestones:
+        for i, t in enumerate(tasks):
+            by_drop.setdefault(str(t["drop_number"]), []).append(i)
+
+    unscheduled = [i for i in range(n) if not scheduled[i]]
+    task_rows = [
+        {
+            "task_id": ids[i],
+            "description": tasks[i]["task_description"],
+            "status": tasks[i]["status"],
+            "drop_number": tasks[i]["drop_number"],
+            "duration": duration[i],
+            "earliest_start": earliest[i],
+            "earliest_finish": earliest[i] + duration[i],
+            "latest_start": latest[i] - duration[i],
+            "latest_finish": latest[i],
+            "slack": slack[i],
+            "critical": critical[i],
+            "prerequisites": [ids[p] for p in preds[i]],
+        }
+        for i in order
+    ]
+    task_rows += [
+        {
+            "task_id": ids[i],
+            "description": tasks[i]["task_description"],
+            "status": tasks[i]["status"],
+            "drop_number": tasks[i]["drop_number"],
+            "duration": duration[i],
+            "earliest_start": None,
+            "earliest_finish": None,
+            "latest_start": None,
+            "latest_finish": None,
+            "slack": None,
+            "critical": False,
+            "prerequisites": [ids[p] for p in preds[i]],
+        }
+        for i in unscheduled
+    ]
+
+    return {
+        "duration": end,
+        "critical_path": [ids[i] for i in chain],
+        "tasks": task_rows,
+        "milestones": [_milestone(m, tasks, index, by_drop, slack, scheduled) for m in milestones],
+        "cycle_task_ids": [ids[i] for i in cycle],
+        "unscheduled_task_ids": [ids[i] for i in unscheduled],
+        "missing_prerequisites": missing,
+    }
+
+
+def _milestone(m, tasks, index, by_drop, slack, scheduled) -> dict:
+    linked = {index[t] for t in m["linked_task_ids"] or () if t in index}
+    for drop in m["linked_drops"] or ():
+        linked.update(by_drop.get(drop, ()))
+    ends = [tasks[i]["end_date"] for i in linked if tasks[i]["end_date"]]
+    forecast = max(ends, default=None)
+    slacks = [slack[i] for i in linked if scheduled[i]]
+    min_slack = min(slacks, default=None)
+
+    risk = None
+    if m["status"] not in ("met", "missed"):
+        if any(not scheduled[i] for i in linked):
+            risk = "cycle"
+        elif forecast and m["target_date"] and forecast > m["target_date"]:
+            risk = "late"
+        elif min_slack is not None and min_slack <= EPSILON:
+            risk = "no_slack"
+    return {
+        "milestone_id": m["milestone_id"],
+        "name": m["name"],
+        "target_date": m["target_date"],
+        "forecast_date": forecast,
+        "constraint_type": m["constraint_type"],
+        "status": m["status"],
+        "linked_tasks": len(linked),
+        "slack": min_slack,
+        "risk": risk,
+        "at_risk": risk is not None,
+    }
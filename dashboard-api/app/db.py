@@ -1,32 +1,54 @@
+import asyncio
 import os
+import time
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.metrics import CONNECT_SECONDS, TimedQueuePool, instrument_engine
 
 _engine = None
 
+# Handlers are async, so concurrency is bounded by this pool rather than by
+# the threadpool; a cached response does not check out a connection at all.
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DASHBOARD_DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DASHBOARD_DB_MAX_OVERFLOW", "20")),
+    "pool_timeout": float(os.getenv("DASHBOARD_DB_POOL_TIMEOUT", "10")),
+    "pool_pre_ping": True,
+    "poolclass": TimedQueuePool,
+}
+
 
 def _build_engine():
     instance_name = os.getenv("INSTANCE_CONNECTION_NAME")
 
     if instance_name:
-        from google.cloud.sql.connector import Connector
+        from google.cloud.sql.connector import create_async_connector
 
-        connector = Connector()
+        connector = None
+        lock = asyncio.Lock()
 
-        def getconn():
-            return connector.connect(
+        async def getconn():
+            nonlocal connector
+            async with lock:
+                if connector is None:
+                    connector = await create_async_connector()
+            started = time.perf_counter()
+            conn = await connector.connect_async(
                 instance_name,
-                "pg8000",
+                "asyncpg",
                 user=os.environ["DB_USER"],
                 password=os.environ["DB_PASS"],
                 db=os.environ["DB_NAME"],
             )
+            CONNECT_SECONDS.observe(time.perf_counter() - started)
+            return conn
 
-        return create_engine(
-            "postgresql+pg8000://",
-            creator=getconn,
-            pool_pre_ping=True,
+        return create_async_engine(
+            "postgresql+asyncpg://",
+            async_creator=getconn,
+            **POOL_OPTIONS,
         )
 
     database_url = os.getenv("DATABASE_URL")
@@ -34,25 +56,29 @@ def _build_engine():
         raise RuntimeError(
             "Set INSTANCE_CONNECTION_NAME (Cloud SQL) or DATABASE_URL (local)"
         )
-    return create_engine(database_url, pool_pre_ping=True)
+    # Accept the same postgresql:// URLs as before and swap in the async driver.
+    url = make_url(database_url).set(drivername="postgresql+asyncpg")
+    return create_async_engine(url, **POOL_OPTIONS)
 
 
 def get_engine():
     global _engine
     if _engine is None:
         _engine = _build_engine()
+        instrument_engine(_engine)
     return _engine
 
 
 SessionLocal = None
 
 
-def get_db():
+def new_session() -> AsyncSession:
     global SessionLocal
     if SessionLocal is None:
-        SessionLocal = sessionmaker(bind=get_engine())
-    session = SessionLocal()
-    try:
+        SessionLocal = async_sessionmaker(bind=get_engine())
+    return SessionLocal()
+
+
+async def get_db():
+    async with new_session() as session:
         yield session
-    finally:
-        session.close()
@@ -0,0 +1,77 @@
+from datetime import date
+from urllib.parse import urlencode
+
+from fastapi import HTTPException, Query
+
+# Customer code the feeds use for projects without a customer.
+NO_CUSTOMER = "__NONE__"
+PROJECT_STATUSES = ("active", "paused", "completed", "archived")
+DEFAULT_PROJECT_STATUSES = ("active", "paused")
+
+
+def split_values(values: list[str] | None) -> list[str]:
+    """``?x=a,b&x=c`` -> ``["a", "b", "c"]``, distinct and sorted."""
+    return sorted({part.strip() for value in values or () for part in value.split(",") if part.strip()})
+
+
+class Filters:
+    """Bound parameters and SQL conditions for one filtered feed request.
+
+    Conditions are fixed SQL fragments; request values only ever reach the
+    query as bind parameters.
+    """
+
+    def __init__(self, date_from: date | None, date_to: date | None):
+        if date_from and date_to and date_from > date_to:
+            raise HTTPException(422, "'from' must not be after 'to'")
+        self.date_from = date_from
+        self.date_to = date_to
+        self.params: dict = {}
+        self._query: dict[str, str] = {}
+
+    @property
+    def windowed(self) -> bool:
+        return self.date_from is not None or self.date_to is not None
+
+    def overlap(self, alias: str) -> list[str]:
+        """Conditions keeping rows of ``alias`` whose dates overlap the window."""
+        conditions = []
+        if self.date_to is not None:
+            conditions.append(f"{alias}.start_date <= :date_to")
+            self.params["date_to"] = self.date_to
+            self._query["to"] = self.date_to.isoformat()
+        if self.date_from is not None:
+            conditions.append(f"{alias}.end_date >= :date_from")
+            self.params["date_from"] = self.date_from
+            self._query["from"] = self.date_from.isoformat()
+        return conditions
+
+    def any_of(self, name: str, column: str, values: list[str], default: tuple[str, ...] = ()) -> list[str]:
+        """Condition keeping rows whose ``column`` is one of ``values`` (or ``default``)."""
+        values = values or sorted(default)
+        if not values:
+            return []
+        self.params[name] = values
+        if values != sorted(default):
+            self._query[name] = ",".join(values)
+        return [f"{column} = ANY(:{name})"]
+
+    @property
+    def variant(self) -> str | None:
+        """Canonical query string used as the cache variant; None when unfiltered."""
+        return urlencode(sorted(self._query.items())) or None
+
+
+def date_window(
+    date_from: date | None = Query(None, alias="from", description="Keep rows ending on or after this date"),
+    date_to: date | None = Query(None, alias="to", description="Keep rows starting on or before this date"),
+) -> Filters:
+    return Filters(date_from, date_to)
+
+
+def project_statuses(status: list[str] | None = Query(None, description="Repeated or comma-separated")) -> list[str]:
+    statuses = split_values(status)
+    unknown = sorted(set(statuses) - set(PROJECT_STATUSES))
+    if unknown:
+        raise HTTPException(422, f"Unknown status(es): {', '.join(unknown)}; allowed: {', '.join(PROJECT_STATUSES)}")
+    return statuses
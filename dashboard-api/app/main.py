@@ -1,9 +1,22 @@
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+
+from app.cache import publish_cache
+from app.compression import CompressionMiddleware
+from app.db import new_session
+from app.metrics import MetricsMiddleware, metrics_response
+from app.routers import capacity, commitments, critical_path, gantt, projects
+
+log = logging.getLogger(__name__)
 
-from app.routers import commitments, gantt, projects
+app = FastAPI(title="Dashboard API", root_path="/dashboard-api", default_response_class=ORJSONResponse)
 
-app = FastAPI(title="Dashboard API", root_path="/dashboard-api")
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,7 +25,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(capacity.router)
 app.include_router(commitments.router)
+app.include_router(critical_path.router)
 app.include_router(gantt.router)
 app.include_router(projects.router)
 
@@ -20,3 +35,25 @@ app.include_router(projects.router)
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def ready():
+    """503 until the database answers, so traffic only reaches instances that can serve it."""
+    try:
+        async with new_session() as db:
+            await db.execute(text("SELECT 1"))
+    except Exception as exc:  # connector and driver errors are not all SQLAlchemyError
+        log.warning("readiness check failed: %s", exc)
+        return ORJSONResponse({"status": "unavailable"}, status_code=503)
+    return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
+
+
+@app.get("/cache-stats")
+def cache_stats():
+    return publish_cache.stats()
@@ -0,0 +1,139 @@
+import time
+from contextvars import ContextVar
+
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.routing import Match
+
+# Labels are route templates ("/projects/{project_id}/tasks"), never raw
+# paths, so the series count stays bounded. Statements run outside a request
+# are labelled "background".
+BACKGROUND = "background"
+UNMATCHED = "unmatched"
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request latency by route template", ["method", "route", "status"],
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being served", ["method", "route"])
+
+QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "SQL statement latency by route template", ["route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "SQL statements issued per request", ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+)
+
+POOL_SIZE = Gauge("db_pool_size", "Configured pool size")
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections checked out of the pool")
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond the pool size (negative: unopened pool slots)")
+POOL_CONNECTS = Counter("db_pool_connections_opened_total", "New database connections opened by the pool")
+POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds", "Time to get a connection from the pool, including opening a new one",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Checkouts that gave up waiting for a connection")
+CONNECT_SECONDS = Histogram(
+    "cloudsql_connect_seconds", "Cloud SQL connector connection setup time",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+
+
+class _RequestStats:
+    __slots__ = ("route", "queries")
+
+    def __init__(self, route: str):
+        self.route = route
+        self.queries = 0
+
+
+_current: ContextVar[_RequestStats | None] = ContextVar("metrics_request", default=None)
+
+
+def route_template(scope) -> str:
+    partial = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path  # right path, wrong method
+    return partial or UNMATCHED
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight requests and SQL per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        method, route = scope["method"], route_template(scope)
+        stats = _RequestStats(route)
+        token = _current.set(stats)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUEST_SECONDS.labels(method, route, str(status)).observe(time.perf_counter() - started)
+            QUERIES_PER_REQUEST.labels(route).observe(stats.queries)
+            in_flight.dec()
+            _current.reset(token)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeout:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_WAIT_SECONDS.observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine):
+    """Attach the pool and statement metrics to an AsyncEngine."""
+    engine = engine.sync_engine
+    # Pool occupancy is read when scraped; checkin events fire before the
+    # pool's own count drops.
+    pool = engine.pool
+    POOL_SIZE.set_function(pool.size)
+    POOL_CHECKED_OUT.set_function(pool.checkedout)
+    POOL_OVERFLOW.set_function(pool.overflow)
+    event.listen(engine, "connect", lambda *args: POOL_CONNECTS.inc())
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        context.metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context.metrics_started
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+        QUERY_SECONDS.labels(stats.route if stats else BACKGROUND).observe(elapsed)
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,36 @@
+from typing import Literal
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import cached_json, publish_cache
+from app.capacity import capacity_model
+from app.db import get_db
+from app.filters import Filters, date_window, split_values
+
+router = APIRouter()
+
+
+@router.get("/capacity")
+async def get_capacity(
+    request: Request,
+    filters: Filters = Depends(date_window),
+    resource_type: list[str] | None = Query(None, description="Repeated or comma-separated"),
+    granularity: Literal["day", "week"] = "week",
+    db: AsyncSession = Depends(get_db),
+):
+    resource_types = split_values(resource_type)
+    query = {
+        "from": filters.date_from and filters.date_from.isoformat(),
+        "to": filters.date_to and filters.date_to.isoformat(),
+        "resource_type": ",".join(resource_types),
+        "granularity": granularity if granularity != "week" else None,
+    }
+    variant = urlencode(sorted((k, v) for k, v in query.items() if v)) or None
+
+    async def build():
+        await capacity_model.ensure(db, await publish_cache.version(db))
+        return capacity_model.timeline(resource_types, filters.date_from, filters.date_to, granularity)
+
+    return await cached_json(request, db, "capacity", build, variant=variant)
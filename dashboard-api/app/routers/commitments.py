@@ -1,29 +1,45 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import cached_json
 from app.db import get_db
+from app.filters import Filters, date_window, split_values
 
 router = APIRouter()
 
-COMMITMENTS_SQL = text("""
+COMMITMENTS_SQL = """
     SELECT commitment_id, description, resource_type,
            start_date, end_date, resource_count, color
-    FROM pmopt.commitments
+    FROM pmopt.commitments c
+    WHERE {where}
     ORDER BY start_date, resource_type
-""")
+"""
 
 
 @router.get("/commitments")
-def get_commitments(db: Session = Depends(get_db)):
-    rows = db.execute(COMMITMENTS_SQL).mappings().all()
+async def get_commitments(
+    request: Request,
+    filters: Filters = Depends(date_window),
+    resource_type: list[str] | None = Query(None, description="Repeated or comma-separated"),
+    db: AsyncSession = Depends(get_db),
+):
+    conditions = filters.overlap("c") + filters.any_of("resource_type", "c.resource_type", split_values(resource_type))
+    sql = text(COMMITMENTS_SQL.format(where=" AND ".join(conditions) or "TRUE"))
+    return await cached_json(
+        request, db, "commitments", lambda: _build_commitments(db, sql, filters.params), variant=filters.variant,
+    )
+
+
+async def _build_commitments(db: AsyncSession, sql, params: dict) -> list[dict]:
+    rows = (await db.execute(sql, params)).mappings().all()
     return [
         {
             "commitment_id": row["commitment_id"],
             "description": row["description"],
             "resource_type": row["resource_type"],
-            "start_date": row["start_date"].isoformat(),
-            "end_date": row["end_date"].isoformat(),
+            "start_date": row["start_date"],
+            "end_date": row["end_date"],
             "resource_count": row["resource_count"],
             "color": row["color"],
         }
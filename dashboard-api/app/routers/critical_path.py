@@ -0,0 +1,77 @@
+from itertools import groupby
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import cached_json
+from app.critical_path import queries, schedule
+from app.db import get_db
+from app.filters import DEFAULT_PROJECT_STATUSES, Filters, project_statuses
+
+router = APIRouter()
+
+PROJECTS_SQL = "SELECT project_id, project_name FROM pmopt.projects p WHERE {where} ORDER BY p.project_name, p.project_id"
+
+
+@router.get("/critical-path")
+async def get_portfolio_critical_path(
+    request: Request, status: list[str] = Depends(project_statuses), db: AsyncSession = Depends(get_db),
+):
+    filters = Filters(None, None)
+    where = " AND ".join(filters.any_of("status", "p.status", status, default=DEFAULT_PROJECT_STATUSES))
+    return await cached_json(
+        request, db, "critical-path", lambda: _build_portfolio(db, where, filters.params), variant=filters.variant,
+    )
+
+
+@router.get("/projects/{project_id}/critical-path")
+async def get_project_critical_path(project_id: str, request: Request, db: AsyncSession = Depends(get_db)):
+    return await cached_json(
+        request, db, "critical-path", lambda: _build_project(db, project_id), project_id=project_id,
+    )
+
+
+async def _load(db: AsyncSession, where: str, params: dict):
+    tasks_sql, milestones_sql = queries(where)
+    tasks = (await db.execute(tasks_sql, params)).mappings().all()
+    milestones = (await db.execute(milestones_sql, params)).mappings().all()
+    by_project = {key: list(rows) for key, rows in groupby(tasks, key=lambda r: r["project_id"])}
+    milestones_by_project = {key: list(rows) for key, rows in groupby(milestones, key=lambda r: r["project_id"])}
+    return by_project, milestones_by_project
+
+
+async def _build_project(db: AsyncSession, project_id: str) -> dict:
+    where, params = "p.project_id = :project_id", {"project_id": project_id}
+    project = (await db.execute(text(PROJECTS_SQL.format(where=where)), params)).mappings().first()
+    if project is None:
+        raise HTTPException(404, "Project not found")
+    tasks, milestones = await _load(db, where, params)
+    plan = await run_in_threadpool(schedule, tasks.get(project_id, []), milestones.get(project_id, []))
+    return {"project_id": project["project_id"], "project_name": project["project_name"], **plan}
+
+
+async def _build_portfolio(db: AsyncSession, where: str, params: dict) -> list[dict]:
+    projects = (await db.execute(text(PROJECTS_SQL.format(where=where)), params)).mappings().all()
+    tasks, milestones = await _load(db, where, params)
+    # Scheduling a large portfolio is CPU work; keep it off the event loop.
+    return await run_in_threadpool(_summaries, projects, tasks, milestones)
+
+
+def _summaries(projects, tasks: dict, milestones: dict) -> list[dict]:
+    result = []
+    for project in projects:
+        plan = schedule(tasks.get(project["project_id"], []), milestones.get(project["project_id"], []))
+        result.append({
+            "project_id": project["project_id"],
+            "project_name": project["project_name"],
+            "duration": plan["duration"],
+            "tasks": len(plan["tasks"]),
+            "critical_tasks": sum(t["critical"] for t in plan["tasks"]),
+            "critical_path": plan["critical_path"],
+            "milestones_at_risk": [m for m in plan["milestones"] if m["at_risk"]],
+            "cycle_task_ids": plan["cycle_task_ids"],
+            "missing_prerequisites": len(plan["missing_prerequisites"]),
+        })
+    return result
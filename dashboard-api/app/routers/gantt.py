@@ -1,12 +1,20 @@
-from fastapi import APIRouter, Depends
+import os
+
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import cached_json
 from app.db import get_db
+from app.filters import DEFAULT_PROJECT_STATUSES, NO_CUSTOMER, Filters, date_window, project_statuses, split_values
 
 router = APIRouter()
 
-GANTT_SQL = text("""
+# Let Postgres assemble the customer -> project -> drops document and hand the
+# encoded JSON straight to the response; set to 0 to build it in Python.
+SQL_JSON = os.getenv("DASHBOARD_GANTT_SQL_JSON", "1") != "0"
+
+GANTT_SQL = """
     SELECT
         COALESCE(c.customer_code, '__NONE__')  AS customer_code,
         COALESCE(c.description, 'No Customer') AS customer_description,
@@ -20,15 +28,90 @@ GANTT_SQL = text("""
         d.status        AS drop_status
     FROM pmopt.projects p
     LEFT JOIN pmopt.customers c ON c.customer_id = p.customer_id
-    LEFT JOIN pmopt.drops     d ON d.project_id = p.project_id
-    WHERE p.status IN ('active', 'paused')
-    ORDER BY customer_code, p.project_name, d.drop_number
-""")
+    LEFT JOIN pmopt.drops     d ON d.project_id = p.project_id{drop_filter}
+    WHERE {project_filter}
+    ORDER BY customer_code, p.project_name, p.project_id, d.drop_number
+"""
+
+
+# Same shape and order as _build_gantt: customers by code, projects by name and id,
+# drops by number, and an empty drops list for projects without any.
+GANTT_JSON_SQL = """
+    SELECT COALESCE(json_agg(customer ORDER BY code), '[]')::text
+    FROM (
+        SELECT
+            code,
+            json_build_object(
+                'customer_code', NULLIF(code, '__NONE__'),
+                'customer_description', MIN(customer_description),
+                'projects', json_agg(project ORDER BY project_name, project_id)
+            ) AS customer
+        FROM (
+            SELECT
+                COALESCE(c.customer_code, '__NONE__')  AS code,
+                COALESCE(c.description, 'No Customer') AS customer_description,
+                p.project_name,
+                p.project_id,
+                json_build_object(
+                    'project_id',   p.project_id::text,
+                    'project_name', p.project_name,
+                    'color',        p.color,
+                    'status',       p.status,
+                    'drops', COALESCE((
+                        SELECT json_agg(json_build_object(
+                                   'drop_number', d.drop_number,
+                                   'start_date',  d.start_date,
+                                   'end_date',    d.end_date,
+                                   'status',      d.status
+                               ) ORDER BY d.drop_number)
+                        FROM pmopt.drops d
+                        WHERE d.project_id = p.project_id
+                          AND d.drop_number IS NOT NULL{drop_filter}
+                    ), '[]')
+                ) AS project
+            FROM pmopt.projects p
+            LEFT JOIN pmopt.customers c ON c.customer_id = p.customer_id
+            WHERE {project_filter}
+        ) projects
+        GROUP BY code
+    ) customers
+"""
+
+
+def _gantt_query(template: str, filters: Filters, customers: list[str], statuses: list[str]):
+    project = filters.any_of("status", "p.status", statuses, default=DEFAULT_PROJECT_STATUSES)
+    project += filters.any_of("customer", f"COALESCE(c.customer_code, '{NO_CUSTOMER}')", customers)
+    drop = filters.overlap("d")
+    if drop:
+        # With a window, projects without a drop inside it are left out.
+        within = " AND ".join(filters.overlap("w"))
+        project.append(f"EXISTS (SELECT 1 FROM pmopt.drops w WHERE w.project_id = p.project_id AND {within})")
+    sql = template.format(
+        project_filter=" AND ".join(project),
+        drop_filter="".join(f" AND {condition}" for condition in drop),
+    )
+    return text(sql), filters.params
 
 
 @router.get("/gantt")
-def get_gantt(db: Session = Depends(get_db)):
-    rows = db.execute(GANTT_SQL).mappings().all()
+async def get_gantt(
+    request: Request,
+    filters: Filters = Depends(date_window),
+    customer: list[str] | None = Query(None, description=f"Customer codes, {NO_CUSTOMER} for none"),
+    status: list[str] = Depends(project_statuses),
+    db: AsyncSession = Depends(get_db),
+):
+    build = _build_gantt_json if SQL_JSON else _build_gantt
+    query = _gantt_query(GANTT_JSON_SQL if SQL_JSON else GANTT_SQL, filters, split_values(customer), status)
+    return await cached_json(request, db, "gantt", lambda: build(db, *query), variant=filters.variant)
+
+
+async def _build_gantt_json(db: AsyncSession, sql, params: dict) -> bytes:
+    return (await db.scalar(sql, params)).encode()
+
+
+async def _build_gantt(db: AsyncSession, sql, params: dict) -> list[dict]:
+    rows = (await db.execute(sql, params)).mappings().all()
 
     customers: dict[str, dict] = {}
 
@@ -56,8 +139,8 @@ def get_gantt(db: Session = Depends(get_db)):
             proj_map[proj_id]["drops"].append(
                 {
                     "drop_number": row["drop_number"],
-                    "start_date": row["start_date"].isoformat() if row["start_date"] else None,
-                    "end_date": row["end_date"].isoformat() if row["end_date"] else None,
+                    "start_date": row["start_date"],
+                    "end_date": row["end_date"],
                     "status": row["drop_status"],
                 }
             )
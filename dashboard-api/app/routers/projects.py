@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import cached_json
 from app.db import get_db
+from app.streaming import ndjson_response, wants_stream
 
 router = APIRouter()
 
@@ -45,17 +47,21 @@ TASKS_SQL = text("""
 
 
 @router.get("/published-time")
-def get_published_time(db: Session = Depends(get_db)):
+async def get_published_time(db: AsyncSession = Depends(get_db)):
     try:
-        row = db.execute(PUBLISHED_TIME_SQL).mappings().first()
+        row = (await db.execute(PUBLISHED_TIME_SQL)).mappings().first()
         return {"published_time": row["parameter_value"] if row else None}
     except Exception:
         return {"published_time": None}
 
 
 @router.get("/projects")
-def list_projects(db: Session = Depends(get_db)):
-    rows = db.execute(PROJECTS_SQL).mappings().all()
+async def list_projects(request: Request, db: AsyncSession = Depends(get_db)):
+    return await cached_json(request, db, "projects", lambda: _build_projects(db))
+
+
+async def _build_projects(db: AsyncSession) -> list[dict]:
+    rows = (await db.execute(PROJECTS_SQL)).mappings().all()
     return [
         {
             "project_id": r["project_id"],
@@ -68,22 +74,31 @@ def list_projects(db: Session = Depends(get_db)):
 
 
 @router.get("/projects/{project_id}/tasks")
-def get_project_tasks(project_id: str, db: Session = Depends(get_db)):
-    rows = db.execute(TASKS_SQL, {"project_id": project_id}).mappings().all()
-    return [
-        {
-            "task_id": r["task_id"],
-            "description": r["task_description"],
-            "status": r["status"],
-            "resource": r["assigned_resource"],
-            "resource_type": r["resource_type"],
-            "duration": r["estimated_duration"],
-            "start_date": r["start_date"].isoformat() if r["start_date"] else None,
-            "end_date": r["end_date"].isoformat() if r["end_date"] else None,
-            "baseline_start_date": r["baseline_start_date"].isoformat() if r["baseline_start_date"] else None,
-            "baseline_end_date": r["baseline_end_date"].isoformat() if r["baseline_end_date"] else None,
-            "drop_number": r["drop_number"],
-            "jira_key": r["jira_key"],
-        }
-        for r in rows
-    ]
+async def get_project_tasks(
+    project_id: str, request: Request, stream: bool = False, db: AsyncSession = Depends(get_db),
+):
+    if wants_stream(request, stream):
+        return ndjson_response(TASKS_SQL, {"project_id": project_id}, _task_dict)
+    return await cached_json(request, db, "tasks", lambda: _build_project_tasks(db, project_id), project_id=project_id)
+
+
+def _task_dict(r) -> dict:
+    return {
+        "task_id": r["task_id"],
+        "description": r["task_description"],
+        "status": r["status"],
+        "resource": r["assigned_resource"],
+        "resource_type": r["resource_type"],
+        "duration": r["estimated_duration"],
+        "start_date": r["start_date"],
+        "end_date": r["end_date"],
+        "baseline_start_date": r["baseline_start_date"],
+        "baseline_end_date": r["baseline_end_date"],
+        "drop_number": r["drop_number"],
+        "jira_key": r["jira_key"],
+    }
+
+
+async def _build_project_tasks(db: AsyncSession, project_id: str) -> list[dict]:
+    rows = (await db.execute(TASKS_SQL, {"project_id": project_id})).mappings().all()
+    return [_task_dict(r) for r in rows]
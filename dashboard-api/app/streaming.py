@@ -0,0 +1,28 @@
+import orjson
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import TextClause
+
+from app.db import new_session
+
+NDJSON = "application/x-ndjson"
+STREAM_BATCH = 1000
+
+
+def wants_stream(request: Request, stream: bool) -> bool:
+    return stream or NDJSON in request.headers.get("accept", "")
+
+
+def ndjson_response(sql: TextClause, params: dict, to_dict, batch: int = STREAM_BATCH) -> StreamingResponse:
+    """Stream rows of ``sql`` through ``to_dict`` as NDJSON from a server-side cursor.
+
+    The generator opens its own session: the request's get_db session is
+    closed before the response body starts streaming.
+    """
+    async def generate():
+        async with new_session() as db:
+            result = await db.stream(sql.execution_options(yield_per=batch), params)
+            async for rows in result.mappings().partitions():
+                yield b"".join(orjson.dumps(to_dict(row)) + b"\n" for row in rows)
+
+    return StreamingResponse(generate(), media_type=NDJSON)
@@ -0,0 +1,100 @@
+from collections import defaultdict
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.capacity import HOURS_PER_DAY, CapacityModel
+
+
+def _dates(*values):
+    return np.array(values, dtype="datetime64[D]")
+
+
+def _model(tasks, commitments=(), resources=None) -> CapacityModel:
+    """CapacityModel loaded from (type, start, end, hours) tasks and (type, start, end, count) commitments."""
+    def columns(rows):
+        types, starts, ends, amounts = zip(*rows) if rows else ((), (), (), ())
+        return np.array(types, dtype=object), _dates(*starts), _dates(*ends), np.array(amounts, dtype=np.float64)
+
+    model = CapacityModel()
+    model.load(1, *columns(tasks), *columns(commitments), resources or {})
+    return model
+
+
+def _daily(model: CapacityModel, resource_type: str) -> dict[str, float]:
+    row = model.types.index(resource_type)
+    # The cumulative sum leaves float residue on days whose ranges all ended.
+    return {str(day): round(float(v), 6) for day, v in zip(model.days, model.demand[row]) if round(float(v), 6)}
+
+
+def test_weekend_only_task_counts_on_next_monday():
+    # Sat 1 - Sun 2 June 2024, before any working day of the model.
+    model = _model([("dev", "2024-06-01", "2024-06-02", HOURS_PER_DAY)], resources={"dev": 1})
+    assert _daily(model, "dev") == {"2024-06-03": 1.0}
+
+
+def test_weekend_days_inside_a_task_are_skipped():
+    # Fri 7 - Tue 11 June: three working days.
+    model = _model([("dev", "2024-06-07", "2024-06-11", 3 * HOURS_PER_DAY)])
+    assert _daily(model, "dev") == {"2024-06-07": 1.0, "2024-06-10": 1.0, "2024-06-11": 1.0}
+
+
+def test_timeline_weeks_and_over_allocation():
+    model = _model(
+        tasks=[
+            ("dev", "2024-06-01", "2024-06-02", HOURS_PER_DAY),  # rolls to Mon 3
+            ("dev", "2024-06-03", "2024-06-07", 5 * HOURS_PER_DAY),
+            ("qa", "2024-06-10", "2024-06-10", 2 * HOURS_PER_DAY),
+        ],
+        commitments=[("dev", "2024-06-04", "2024-06-05", 1)],
+        resources={"dev": 1, "qa": 3},
+    )
+    dev, qa = model.timeline(granularity="week")
+
+    assert dev["resource_type"] == "dev" and dev["capacity"] == 1.0
+    assert dev["periods"] == [
+        {"start_date": "2024-06-03", "demand": 1.6, "committed": 0.4, "peak": 2.0},
+        {"start_date": "2024-06-10", "demand": 0.0, "committed": 0.0, "peak": 0.0},
+    ]
+    assert dev["over_allocated"] == [
+        {"start_date": "2024-06-03", "end_date": "2024-06-05", "days": 3, "peak_demand": 2.0, "excess_days": 3.0},
+    ]
+    assert qa["periods"][1] == {"start_date": "2024-06-10", "demand": 2.0, "committed": 0.0, "peak": 2.0}
+    assert qa["over_allocated"] == []
+
+    daily = model.timeline(["dev"], date(2024, 6, 4), date(2024, 6, 5), granularity="day")
+    assert [p["demand"] for p in daily[0]["periods"]] == [2.0, 2.0]
+
+
+def _brute_force(tasks) -> dict[tuple[str, str], float]:
+    """Per-day demand by walking every calendar day of every task."""
+    demand = defaultdict(float)
+    for resource_type, start, end, hours in tasks:
+        start, end = date.fromisoformat(start), date.fromisoformat(end)
+        days = [start + timedelta(i) for i in range((end - start).days + 1)]
+        days = [d for d in days if d.weekday() < 5]
+        if not days:
+            day = end + timedelta(1)
+            while day.weekday() >= 5:
+                day += timedelta(1)
+            days = [day]
+        for day in days:
+            demand[(resource_type, day.isoformat())] += hours / (HOURS_PER_DAY * len(days))
+    return {key: round(v, 6) for key, v in demand.items() if v}
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_difference_array_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    origin = date(2024, 6, 1)
+    tasks = []
+    for _ in range(200):
+        start = origin + timedelta(int(rng.integers(0, 60)))
+        end = start + timedelta(int(rng.integers(0, 15)))
+        resource_type = str(rng.choice(["dev", "qa", "ops"]))
+        tasks.append((resource_type, start.isoformat(), end.isoformat(), float(rng.integers(1, 80))))
+    model = _model(tasks)
+
+    got = {(t, day): v for t in model.types for day, v in _daily(model, t).items()}
+    assert got == pytest.approx(_brute_force(tasks))
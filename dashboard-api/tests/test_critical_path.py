@@ -0,0 +1,114 @@
+from datetime import date
+
+from app.critical_path import schedule
+
+
+def _task(task_id, duration, *prerequisites, status="in_progress", drop=1, end_date=None):
+    return {
+        "task_id": task_id,
+        "task_description": task_id,
+        "status": status,
+        "drop_number": drop,
+        "end_date": end_date,
+        "duration": duration,
+        "prerequisites": list(prerequisites),
+    }
+
+
+def _milestone(milestone_id, *, tasks=(), drops=(), target=None, status="pending"):
+    return {
+        "milestone_id": milestone_id,
+        "name": milestone_id,
+        "target_date": target,
+        "constraint_type": "finish_by",
+        "status": status,
+        "linked_task_ids": list(tasks),
+        "linked_drops": list(drops),
+    }
+
+
+def _by_id(result):
+    return {t["task_id"]: t for t in result["tasks"]}
+
+
+def test_critical_path_and_slack():
+    # A(2) -> B(3) -> D(1), and A -> C(1) -> D: C has two hours of slack.
+    result = schedule([
+        _task("D", 1, "B", "C"),
+        _task("C", 1, "A"),
+        _task("B", 3, "A"),
+        _task("A", 2),
+    ], [])
+
+    assert result["duration"] == 6.0
+    assert result["critical_path"] == ["A", "B", "D"]
+    tasks = _by_id(result)
+    assert (tasks["C"]["earliest_start"], tasks["C"]["latest_start"], tasks["C"]["slack"]) == (2.0, 4.0, 2.0)
+    assert [t for t in tasks if tasks[t]["critical"]] == ["A", "B", "D"]
+    assert result["cycle_task_ids"] == result["unscheduled_task_ids"] == []
+
+
+def test_completed_tasks_take_no_time():
+    result = schedule([_task("A", 0, status="completed"), _task("B", 4, "A")], [])
+    assert result["duration"] == 4.0
+    assert _by_id(result)["B"]["earliest_start"] == 0.0
+
+
+def test_cycle_is_peeled_from_what_is_behind_it():
+    # S feeds the P <-> Q cycle; R only waits on it, so it is unscheduled but not on the cycle.
+    result = schedule([
+        _task("S", 1),
+        _task("P", 1, "S", "Q"),
+        _task("Q", 1, "P"),
+        _task("R", 1, "Q"),
+    ], [])
+
+    assert result["cycle_task_ids"] == ["P", "Q"]
+    assert result["unscheduled_task_ids"] == ["P", "Q", "R"]
+    tasks = _by_id(result)
+    assert tasks["S"]["earliest_finish"] == 1.0 and tasks["S"]["critical"]
+    assert tasks["R"]["slack"] is None and not tasks["R"]["critical"]
+
+
+def test_self_loop_is_a_cycle():
+    result = schedule([_task("X", 2, "X"), _task("Y", 1, "X"), _task("Z", 3)], [])
+
+    assert result["cycle_task_ids"] == ["X"]
+    assert result["unscheduled_task_ids"] == ["X", "Y"]
+    assert result["critical_path"] == ["Z"]
+    assert result["duration"] == 3.0
+
+
+def test_missing_and_repeated_prerequisites():
+    result = schedule([_task("A", 2), _task("B", 1, "A", "A", "gone")], [])
+
+    assert result["missing_prerequisites"] == [{"task_id": "B", "prerequisite": "gone"}]
+    tasks = _by_id(result)
+    assert tasks["B"]["prerequisites"] == ["A"]
+    assert tasks["B"]["earliest_start"] == 2.0
+    assert result["unscheduled_task_ids"] == []
+
+
+def test_milestone_risk():
+    tasks = [
+        _task("A", 2, end_date=date(2024, 6, 10), drop=1),
+        _task("B", 1, end_date=date(2024, 6, 20), drop=2),
+        _task("C", 5, drop=3),
+        _task("L", 1, "L", drop=4),
+    ]
+    result = schedule(tasks, [
+        _milestone("late", drops=["2"], target=date(2024, 6, 14)),
+        _milestone("no_slack", tasks=["C"]),
+        _milestone("cycle", drops=["4"]),
+        _milestone("met", tasks=["B"], target=date(2024, 6, 14), status="met"),
+        _milestone("fine", tasks=["A"], target=date(2024, 6, 14)),
+    ])
+
+    risks = {m["milestone_id"]: (m["risk"], m["forecast_date"], m["linked_tasks"]) for m in result["milestones"]}
+    assert risks == {
+        "late": ("late", date(2024, 6, 20), 1),
+        "no_slack": ("no_slack", None, 1),
+        "cycle": ("cycle", None, 1),
+        "met": (None, date(2024, 6, 20), 1),
+        "fine": (None, date(2024, 6, 10), 1),
+    }
@@ -30,12 +30,44 @@ echo "==> Configuring Docker auth..."
 gcloud auth configure-docker "${REGION}-docker.pkg.dev" --quiet
 
 # --- Backend ---
+# SKIP_TESTS=1 ./deploy.sh deploys without the test run (e.g. on a host
+# without Docker Compose, or when the suite already passed for this commit).
+if [ "${SKIP_TESTS:-0}" = "1" ]; then
+  echo "==> Skipping backend tests (SKIP_TESTS=1)"
+else
+  echo "==> Running backend tests..."
+  if ! docker compose --profile test run --rm backend-tests; then
+    docker compose --profile test down
+    echo "Backend tests failed; not deploying." >&2
+    exit 1
+  fi
+  docker compose --profile test down
+fi
+
 echo "==> Building backend..."
 docker build -t "${REGISTRY}/pm-backend:latest" ./backend
 
 echo "==> Pushing backend..."
 docker push "${REGISTRY}/pm-backend:latest"
 
+BACKEND_ENV="^||^INSTANCE_CONNECTION_NAME=${INSTANCE_CONNECTION_NAME}||DB_USER=${BACKEND_DB_USER}||DB_PASS=${BACKEND_DB_PASS}||DB_NAME=${BACKEND_DB_NAME}"
+
+# Migrations, search indexes and seed data run once per deploy as a job, so
+# service instances can start in fast mode without touching the schema.
+echo "==> Migrating backend database..."
+gcloud run jobs deploy pm-backend-setup \
+  --image="${REGISTRY}/pm-backend:latest" \
+  --region="$REGION" \
+  --project="$PROJECT" \
+  --memory=512Mi \
+  --command=python \
+  --args="-m,app.migrate,setup" \
+  --set-env-vars="$BACKEND_ENV"
+gcloud run jobs execute pm-backend-setup \
+  --region="$REGION" \
+  --project="$PROJECT" \
+  --wait
+
 echo "==> Deploying backend..."
 gcloud run deploy pm-backend \
   --image="${REGISTRY}/pm-backend:latest" \
@@ -43,8 +75,9 @@ gcloud run deploy pm-backend \
   --project="$PROJECT" \
   --port=8000 \
   --memory=512Mi \
+  --cpu-boost \
   --allow-unauthenticated \
-  --set-env-vars="^||^INSTANCE_CONNECTION_NAME=${INSTANCE_CONNECTION_NAME}||DB_USER=${BACKEND_DB_USER}||DB_PASS=${BACKEND_DB_PASS}||DB_NAME=${BACKEND_DB_NAME}"
+  --set-env-vars="${BACKEND_ENV}||STARTUP_MODE=fast"
 
 BACKEND_URL=$(gcloud run services describe pm-backend \
   --region="$REGION" --project="$PROJECT" \
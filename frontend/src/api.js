@@ -0,0 +1,60 @@
+import { useCallback, useEffect, useRef, useState } from "react";
+
+// Rows fetched per "Load more"; the backend accepts up to MAX_PAGE_SIZE (5000).
+const PAGE_SIZE = 200;
+
+// One page of a keyset-paginated list endpoint. Pass the previous page's
+// cursor to continue; `cursor` comes back null after the last page. Only the
+// first page asks the backend for X-Total-Count.
+export async function fetchPage(path, params = {}, cursor = null, signal) {
+  const query = new URLSearchParams({ ...params, limit: PAGE_SIZE });
+  if (cursor) {
+    query.set("cursor", cursor);
+    query.set("include_total", "false");
+  }
+  const r = await fetch(`${path}?${query}`, { signal });
+  if (!r.ok) throw new Error(`${path}: ${r.status}`);
+  const total = r.headers.get("X-Total-Count");
+  return {
+    rows: await r.json(),
+    cursor: r.headers.get("X-Next-Cursor"),
+    total: total === null ? null : Number(total),
+  };
+}
+
+// The first page of `path` for `search`, refetched when either changes;
+// loadMore() appends the next page. A new search aborts a page in flight.
+export function usePagedList(path, search) {
+  const [list, setList] = useState({ rows: [], cursor: null, total: null, loading: true });
+  const controller = useRef(null);
+
+  const load = useCallback(
+    (cursor) => {
+      controller.current?.abort();
+      const c = (controller.current = new AbortController());
+      setList((l) => ({ ...l, loading: true }));
+      fetchPage(path, search ? { search } : {}, cursor, c.signal)
+        .then((page) =>
+          setList((l) => ({
+            rows: cursor ? [...l.rows, ...page.rows] : page.rows,
+            cursor: page.cursor,
+            total: cursor ? l.total : page.total,
+            loading: false,
+          }))
+        )
+        .catch((e) => {
+          if (e.name === "AbortError") return;
+          console.error(e);
+          setList((l) => ({ ...l, loading: false }));
+        });
+    },
+    [path, search]
+  );
+
+  useEffect(() => {
+    load(null);
+    return () => controller.current?.abort();
+  }, [load]);
+
+  return { ...list, loadMore: () => load(list.cursor) };
+}
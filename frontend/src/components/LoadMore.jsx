@@ -0,0 +1,18 @@
+export default function LoadMore({ list, noun }) {
+  if (!list.cursor) return null;
+  return (
+    <div className="flex items-center gap-3 pt-2 text-sm text-gray-500">
+      <button
+        onClick={list.loadMore}
+        disabled={list.loading}
+        className="px-3 py-1.5 rounded-lg border border-gray-200 hover:border-indigo-300 disabled:opacity-50"
+      >
+        {list.loading ? "Loading..." : "Load more"}
+      </button>
+      <span>
+        Showing {list.rows.length}
+        {list.total !== null && ` of ${list.total}`} {noun}
+      </span>
+    </div>
+  );
+}
@@ -1,18 +1,14 @@
 import { useEffect, useState } from "react";
+import { usePagedList } from "../api";
+import LoadMore from "../components/LoadMore";
 
 export default function Applications() {
-  const [apps, setApps] = useState([]);
   const [search, setSearch] = useState("");
+  const list = usePagedList("/api/applications", search);
+  const apps = list.rows;
   const [selected, setSelected] = useState(null);
   const [detail, setDetail] = useState(null);
 
-  useEffect(() => {
-    const params = search ? `?search=${encodeURIComponent(search)}` : "";
-    fetch(`/api/applications${params}`)
-      .then((r) => r.json())
-      .then(setApps);
-  }, [search]);
-
   useEffect(() => {
     if (selected === null) {
       setDetail(null);
@@ -53,9 +49,10 @@ export default function Applications() {
               )}
             </button>
           ))}
-          {apps.length === 0 && (
+          {!list.loading && apps.length === 0 && (
             <p className="text-gray-400 text-sm">No applications found.</p>
           )}
+          <LoadMore list={list} noun="applications" />
         </div>
 
         {/* Detail */}
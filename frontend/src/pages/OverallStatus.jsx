@@ -12,6 +12,37 @@ const OVERALL_VIEW_OPTIONS = [
   { value: "commitments", label: "Commitments" },
 ];
 
+// Time windows fetched from the server; "all" loads the full history.
+const WINDOW_OPTIONS = [
+  { value: "all", label: "All dates" },
+  { value: "quarter", label: "This quarter" },
+  { value: "6m", label: "Next 6 months" },
+  { value: "year", label: "This year" },
+];
+
+function isoDate(d) {
+  return `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, "0")}-${String(d.getDate()).padStart(2, "0")}`;
+}
+
+function windowQuery(value) {
+  const now = new Date();
+  let from, to;
+  if (value === "quarter") {
+    const q = Math.floor(now.getMonth() / 3) * 3;
+    from = new Date(now.getFullYear(), q, 1);
+    to = new Date(now.getFullYear(), q + 3, 0);
+  } else if (value === "6m") {
+    from = new Date(now.getFullYear(), now.getMonth(), 1);
+    to = new Date(now.getFullYear(), now.getMonth() + 6, 0);
+  } else if (value === "year") {
+    from = new Date(now.getFullYear(), 0, 1);
+    to = new Date(now.getFullYear(), 11, 31);
+  } else {
+    return "";
+  }
+  return `?from=${isoDate(from)}&to=${isoDate(to)}`;
+}
+
 const PROGRESS_MAP = {
   completed: 100,
   in_progress: 50,
@@ -35,12 +66,14 @@ export default function OverallStatus() {
   const [commitmentsError, setCommitmentsError] = useState(null);
   const commitmentsGanttRef = useRef(null);
   const [commitmentsViewMode, setCommitmentsViewMode] = useState("Month");
+  const [timeWindow, setTimeWindow] = useState("all");
+  const seenCustomers = useRef(new Set());
 
   useEffect(() => {
     if (selectedView !== "commitments") return;
     setCommitmentsLoading(true);
     setCommitmentsError(null);
-    fetch("/dashboard-api/commitments")
+    fetch(`/dashboard-api/commitments${windowQuery(timeWindow)}`)
       .then((r) => {
         if (!r.ok) throw new Error(`HTTP ${r.status}`);
         return r.json();
@@ -48,20 +81,26 @@ export default function OverallStatus() {
       .then(setCommitments)
       .catch((e) => setCommitmentsError(e.message))
       .finally(() => setCommitmentsLoading(false));
-  }, [selectedView]);
+  }, [selectedView, timeWindow]);
 
   useEffect(() => {
-    fetch("/dashboard-api/gantt")
+    fetch(`/dashboard-api/gantt${windowQuery(timeWindow)}`)
       .then((r) => {
         if (!r.ok) throw new Error(`HTTP ${r.status}`);
         return r.json();
       })
       .then((d) => {
         setData(d);
-        setSelectedCustomers(new Set(d.map((c) => c.customer_code ?? "__NONE__")));
+        // Keep the selection across windows; customers not seen before start selected.
+        const fresh = d.map((c) => c.customer_code ?? "__NONE__").filter((code) => !seenCustomers.current.has(code));
+        fresh.forEach((code) => seenCustomers.current.add(code));
+        setSelectedCustomers((prev) => new Set([...(prev ?? []), ...fresh]));
       })
       .catch((e) => setError(e.message))
       .finally(() => setLoading(false));
+  }, [timeWindow]);
+
+  useEffect(() => {
     fetch("/dashboard-api/published-time")
       .then((r) => r.ok ? r.json() : null)
       .then((d) => { if (d?.published_time) setPublishedTime(d.published_time); })
@@ -102,7 +141,7 @@ export default function OverallStatus() {
   }
 
   function selectAll() {
-    setSelectedCustomers(new Set(customerList.map((c) => c.code)));
+    setSelectedCustomers((prev) => new Set([...prev, ...customerList.map((c) => c.code)]));
   }
 
   function selectNone() {
@@ -310,19 +349,35 @@ export default function OverallStatus() {
         Overall Status{publishedTime ? ` (Published ${new Date(publishedTime).toLocaleString()})` : ""}
       </h1>
 
-      <div className="mb-4">
-        <label className="block text-sm font-medium text-gray-700 mb-1">View</label>
-        <select
-          value={selectedView}
-          onChange={(e) => setSelectedView(e.target.value)}
-          className="border rounded px-3 py-1.5 text-sm min-w-[200px]"
-        >
-          {OVERALL_VIEW_OPTIONS.map((v) => (
-            <option key={v.value} value={v.value}>
-              {v.label}
-            </option>
-          ))}
-        </select>
+      <div className="mb-4 flex gap-4">
+        <div>
+          <label className="block text-sm font-medium text-gray-700 mb-1">View</label>
+          <select
+            value={selectedView}
+            onChange={(e) => setSelectedView(e.target.value)}
+            className="border rounded px-3 py-1.5 text-sm min-w-[200px]"
+          >
+            {OVERALL_VIEW_OPTIONS.map((v) => (
+              <option key={v.value} value={v.value}>
+                {v.label}
+              </option>
+            ))}
+          </select>
+        </div>
+        <div>
+          <label className="block text-sm font-medium text-gray-700 mb-1">Dates</label>
+          <select
+            value={timeWindow}
+            onChange={(e) => setTimeWindow(e.target.value)}
+            className="border rounded px-3 py-1.5 text-sm min-w-[160px]"
+          >
+            {WINDOW_OPTIONS.map((w) => (
+              <option key={w.value} value={w.value}>
+                {w.label}
+              </option>
+            ))}
+          </select>
+        </div>
       </div>
 
       {selectedView === "all-projects-gantt" && (
@@ -350,7 +405,7 @@ export default function OverallStatus() {
                     onClick={() => setFilterOpen((v) => !v)}
                     className="px-3 py-1 rounded text-sm font-medium bg-gray-200 text-gray-700 hover:bg-gray-300"
                   >
-                    Customers ({selectedCustomers?.size ?? 0}/{customerList.length}) ▾
+                    Customers ({customerList.filter((c) => selectedCustomers?.has(c.code)).length}/{customerList.length}) ▾
                   </button>
                   {filterOpen && (
                     <div className="absolute z-20 mt-1 bg-white border rounded shadow-lg w-64 max-h-72 overflow-y-auto">
@@ -1,29 +1,33 @@
 import { useEffect, useState } from "react";
+import { usePagedList } from "../api";
+import LoadMore from "../components/LoadMore";
 
 export default function Tables() {
-  const [tables, setTables] = useState([]);
   const [search, setSearch] = useState("");
+  const list = usePagedList("/api/tables", search);
+  const tables = list.rows;
   const [expanded, setExpanded] = useState(null);
   const [detail, setDetail] = useState(null);
+  const [impact, setImpact] = useState(null);
   const [colApps, setColApps] = useState({});
 
-  useEffect(() => {
-    const params = search ? `?search=${encodeURIComponent(search)}` : "";
-    fetch(`/api/tables${params}`)
-      .then((r) => r.json())
-      .then(setTables);
-  }, [search]);
-
   useEffect(() => {
     if (expanded === null) {
       setDetail(null);
+      setImpact(null);
       return;
     }
     fetch(`/api/tables/${expanded}`)
       .then((r) => r.json())
       .then(setDetail);
+    fetch(`/api/analytics/impact?table_id=${expanded}`)
+      .then((r) => r.json())
+      .then(setImpact);
   }, [expanded]);
 
+  const columnImpact = {};
+  for (const c of impact?.by_column ?? []) columnImpact[c.column_id] = c;
+
   function loadColumnApps(colId) {
     if (colApps[colId]) return;
     fetch(`/api/xref/by-column/${colId}`)
@@ -66,6 +70,26 @@ export default function Tables() {
 
             {expanded === t.id && detail && (
               <div className="px-3 pb-3">
+                {impact && (
+                  <div className="mb-2 text-sm">
+                    <span className="text-gray-500">
+                      Used by {impact.applications} app
+                      {impact.applications === 1 ? "" : "s"} ({impact.writers}{" "}
+                      writing) across {impact.referenced_columns} of{" "}
+                      {impact.columns} columns
+                    </span>
+                    <div className="flex flex-wrap gap-1 mt-1">
+                      {impact.by_application.map((a) => (
+                        <span
+                          key={a.application_id}
+                          className="text-xs px-2 py-0.5 rounded-full bg-indigo-50 text-indigo-700"
+                        >
+                          {a.application_name} ({a.usage_type}, {a.columns})
+                        </span>
+                      ))}
+                    </div>
+                  </div>
+                )}
                 <table className="w-full text-sm">
                   <thead>
                     <tr className="text-left text-gray-500 border-b">
@@ -101,6 +125,12 @@ export default function Tables() {
                                 ))}
                               </div>
                             )
+                          ) : columnImpact[c.id] ? (
+                            <span className="text-gray-400 text-xs">
+                              {columnImpact[c.id].applications === 0
+                                ? "none"
+                                : `${columnImpact[c.id].applications} apps, ${columnImpact[c.id].writers} writing — hover for names`}
+                            </span>
                           ) : (
                             <span className="text-gray-300 text-xs">
                               hover to load
@@ -115,9 +145,10 @@ export default function Tables() {
             )}
           </div>
         ))}
-        {tables.length === 0 && (
+        {!list.loading && tables.length === 0 && (
           <p className="text-gray-400 text-sm">No tables found.</p>
         )}
+        <LoadMore list={list} noun="tables" />
       </div>
     </div>
   );
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for the CSNX Meta backend read API.
+
+Drives every GET /api endpoint at a fixed concurrency with ids and search
+terms sampled from the running catalog, and writes p50/p95/p99 latency and
+throughput per endpoint to a JSON file. Load a production-sized catalog first:
+
+    cd backend && python -m app.synth --replace
+    python bench_api.py --out results.json --update-baseline baseline.json
+    ... change something ...
+    python bench_api.py --out results.json --baseline baseline.json
+
+With --baseline the run exits non-zero when an endpoint's p95 grew, or its
+throughput dropped, by more than --tolerance. Baselines only compare runs on
+the same machine and catalog; the same --seed replays the same requests.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def make_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class Catalog:
+    """Ids and words to build requests from, sampled once from the API."""
+
+    def __init__(self, session: requests.Session, api_url: str):
+        def get(path, **params):
+            resp = session.get(f"{api_url}{path}", params=params, timeout=300)
+            resp.raise_for_status()
+            return resp.json()
+
+        self.app_ids = [a["id"] for a in get("/api/applications", limit=5000)]
+        tables = get("/api/tables", limit=5000)
+        self.table_ids = [t["id"] for t in tables]
+        self.schemas = sorted({t["schema_name"] for t in tables})
+        self.column_ids = [c["id"] for c in get("/api/columns", limit=5000)]
+        words = {w for t in tables for w in t["table_name"].lower().split("_") if len(w) > 3 and not w.isdigit()}
+        self.words = sorted(words) or ["id"]
+        if not (self.app_ids and self.table_ids and self.column_ids):
+            raise SystemExit("The catalog is empty; load one with `python -m app.synth` first")
+
+
+def _ids(rng: random.Random, ids: list[int], n: int) -> str:
+    return ",".join(map(str, rng.sample(ids, min(n, len(ids)))))
+
+
+# (name, route template, request builder). The builder returns a path and
+# query parameters; names are the keys of the results and the baseline.
+SCENARIOS = [
+    ("applications", "/api/applications", lambda c, r: ("/api/applications", {})),
+    ("applications.batch", "/api/applications/batch",
+     lambda c, r: ("/api/applications/batch", {"ids": _ids(r, c.app_ids, 20)})),
+    ("applications.get", "/api/applications/{app_id}",
+     lambda c, r: (f"/api/applications/{r.choice(c.app_ids)}", {})),
+    ("tables", "/api/tables", lambda c, r: ("/api/tables", {"limit": 500})),
+    ("tables.search", "/api/tables",
+     lambda c, r: ("/api/tables", {"search": r.choice(c.words), "limit": 100})),
+    ("tables.batch", "/api/tables/batch",
+     lambda c, r: ("/api/tables/batch", {"ids": _ids(r, c.table_ids, 20), "include": "apps"})),
+    ("tables.get", "/api/tables/{table_id}", lambda c, r: (f"/api/tables/{r.choice(c.table_ids)}", {})),
+    ("columns", "/api/columns", lambda c, r: ("/api/columns", {"limit": 5000})),
+    ("columns.search", "/api/columns",
+     lambda c, r: ("/api/columns", {"search": r.choice(c.words), "limit": 100})),
+    ("columns.batch", "/api/columns/batch",
+     lambda c, r: ("/api/columns/batch", {"ids": _ids(r, c.column_ids, 50)})),
+    ("columns.get", "/api/columns/{column_id}", lambda c, r: (f"/api/columns/{r.choice(c.column_ids)}", {})),
+    ("xref.by_app", "/api/xref/by-app/{app_id}", lambda c, r: (f"/api/xref/by-app/{r.choice(c.app_ids)}", {})),
+    ("xref.by_column", "/api/xref/by-column/{col_id}",
+     lambda c, r: (f"/api/xref/by-column/{r.choice(c.column_ids)}", {})),
+    ("search", "/api/search", lambda c, r: ("/api/search", {"q": r.choice(c.words)})),
+    ("suggest", "/api/suggest", lambda c, r: ("/api/suggest", {"q": r.choice(c.words)[:4]})),
+    ("suggest.stats", "/api/suggest/stats", lambda c, r: ("/api/suggest/stats", {})),
+    ("analytics.coupling", "/api/analytics/coupling",
+     lambda c, r: ("/api/analytics/coupling", {"application_id": r.choice(c.app_ids), "limit": 100})),
+    ("analytics.impact", "/api/analytics/impact",
+     lambda c, r: ("/api/analytics/impact", {"table_id": r.choice(c.table_ids)})),
+    ("catalog.fingerprints", "/api/catalog/fingerprints",
+     lambda c, r: ("/api/catalog/fingerprints", {"schema_name": r.choice(c.schemas),
+                                                 "table_pattern": f"{r.choice(c.words)}%"})),
+    ("health", "/api/health", lambda c, r: ("/api/health", {})),
+    ("health.startup", "/api/health/startup", lambda c, r: ("/api/health/startup", {})),
+    ("health.ready", "/api/health/ready", lambda c, r: ("/api/health/ready", {})),
+]
+
+
+def uncovered_routes(session: requests.Session, api_url: str) -> list[str]:
+    try:
+        resp = session.get(f"{api_url}/openapi.json", timeout=30)
+        resp.raise_for_status()
+    except requests.RequestException:
+        return []
+    covered = {route for _, route, _ in SCENARIOS}
+    return sorted(
+        path for path, ops in resp.json()["paths"].items()
+        if path.startswith("/api/") and "get" in ops and path not in covered
+    )
+
+
+def run_scenario(session: requests.Session, api_url: str, plan: list, concurrency: int, warmup: int) -> dict:
+    latencies, statuses = [], {}
+    total_bytes = 0
+    lock = threading.Lock()
+
+    def fetch(request, record=True):
+        nonlocal total_bytes
+        path, params = request
+        started = time.perf_counter()
+        try:
+            resp = session.get(f"{api_url}{path}", params=params, timeout=300)
+            size, status = len(resp.content), resp.status_code
+        except requests.RequestException:
+            size, status = 0, 0  # connection errors and timeouts
+        elapsed = time.perf_counter() - started
+        if record:
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+                total_bytes += size
+        return status
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        # Warm the server's caches and the connection pool before timing.
+        list(pool.map(lambda r: fetch(r, record=False), plan[:warmup]))
+        started = time.perf_counter()
+        list(pool.map(fetch, plan[warmup:]))
+        wall = time.perf_counter() - started
+
+    ok = sum(n for status, n in statuses.items() if 200 <= status < 400)
+    if not ok:
+        return {"skipped": True, "statuses": {str(s): n for s, n in sorted(statuses.items())}}
+    # Percentiles over every request, failed or not: a fast 500 is still a
+    # request the server had to answer.
+    p = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": len(latencies) - ok,
+        "statuses": {str(s): n for s, n in sorted(statuses.items())},
+        "p50_ms": round(p[49] * 1000, 2),
+        "p95_ms": round(p[94] * 1000, 2),
+        "p99_ms": round(p[98] * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "bytes_per_request": total_bytes // len(latencies),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, now in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before or before.get("skipped") or now.get("skipped"):
+            continue
+        if now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+        if now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {before['throughput_rps']} -> {now['throughput_rps']} req/s")
+        if now["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {now['errors']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the CSNX Meta backend read API")
+    parser.add_argument("--api-url", default="http://localhost:8000", help="CSNX Meta backend URL")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent requests (default: 8)")
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per endpoint (default: 200)")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed requests per endpoint first (default: 20)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the sampled ids and search terms")
+    parser.add_argument(
+        "--only", action="append", default=[], metavar="NAME",
+        help="Run only scenarios whose name starts with NAME (repeatable), e.g. --only xref",
+    )
+    parser.add_argument("--out", default="bench_results.json", help="Results file (default: bench_results.json)")
+    parser.add_argument("--baseline", help="Compare against this earlier results file")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15,
+        help="Allowed p95 growth and throughput drop against the baseline (default: 0.15)",
+    )
+    parser.add_argument("--update-baseline", metavar="PATH", help="Also write the results to PATH")
+    args = parser.parse_args()
+    api_url = args.api_url.rstrip("/")
+
+    session = make_session(args.concurrency)
+    catalog = Catalog(session, api_url)
+    print(
+        f"Catalog sample: {len(catalog.app_ids)} app(s), {len(catalog.table_ids)} table(s), "
+        f"{len(catalog.column_ids)} column(s), {len(catalog.words)} search word(s)"
+    )
+    for route in uncovered_routes(session, api_url):
+        print(f"WARNING: no scenario for GET {route}", file=sys.stderr)
+
+    scenarios = [s for s in SCENARIOS if not args.only or any(s[0].startswith(o) for o in args.only)]
+    results = {
+        "meta": {
+            "api_url": api_url,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "host": platform.node(),
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "scenarios": {},
+    }
+    print(f"\n{'scenario':<22} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>7}")
+    for name, _, build in scenarios:
+        rng = random.Random(f"{args.seed}:{name}")
+        plan = [build(catalog, rng) for _ in range(args.warmup + args.requests)]
+        stats = run_scenario(session, api_url, plan, args.concurrency, args.warmup)
+        results["scenarios"][name] = stats
+        if stats.get("skipped"):
+            print(f"{name:<22} skipped, no successful responses: {stats['statuses']}")
+        else:
+            print(
+                f"{name:<22} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} "
+                f"{stats['throughput_rps']:>9.1f} {stats['errors']:>7}"
+            )
+
+    for path in filter(None, (args.out, args.update_baseline)):
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
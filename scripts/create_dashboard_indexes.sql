@@ -0,0 +1,6 @@
+-- Indexes behind the date-window filters of the dashboard-api /gantt and
+-- /commitments feeds. Publishes TRUNCATE rather than drop the tables, so these
+-- only need to be created once per database.
+CREATE INDEX IF NOT EXISTS idx_pmopt_drops_dates ON pmopt.drops (start_date, end_date);
+CREATE INDEX IF NOT EXISTS idx_pmopt_commitments_dates ON pmopt.commitments (start_date, end_date);
+CREATE INDEX IF NOT EXISTS idx_pmopt_commitments_resource ON pmopt.commitments (resource_type, start_date);
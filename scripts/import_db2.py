@@ -2,10 +2,16 @@
 """Extract table/column metadata from DB2 system catalog and load into CSNX Meta."""
 
 import argparse
+import hashlib
+import json
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import ibm_db
 import requests
+from requests.adapters import HTTPAdapter
 
 
 def format_data_type(typename: str, length: int, scale: int) -> str:
@@ -67,6 +73,205 @@ def fetch_columns(conn, schema: str, table_name: str) -> list[dict]:
     return columns
 
 
+def stream_tables(conn, schema: str, table_pattern: str):
+    """Yield tables with their columns from a single ordered catalog cursor."""
+    sql = (
+        "SELECT T.TABNAME, T.REMARKS AS TABREMARKS, "
+        "C.COLNAME, C.TYPENAME, C.LENGTH, C.SCALE, C.REMARKS "
+        "FROM SYSCAT.TABLES T "
+        "LEFT JOIN SYSCAT.COLUMNS C ON C.TABSCHEMA = T.TABSCHEMA AND C.TABNAME = T.TABNAME "
+        "WHERE T.TABSCHEMA = ? AND T.TABNAME LIKE ? AND T.TYPE = 'T' "
+        "ORDER BY T.TABNAME, C.COLNO"
+    )
+    stmt = ibm_db.prepare(conn, sql)
+    ibm_db.bind_param(stmt, 1, schema)
+    ibm_db.bind_param(stmt, 2, table_pattern)
+    ibm_db.execute(stmt)
+
+    table = None
+    row = ibm_db.fetch_assoc(stmt)
+    while row:
+        name = row["TABNAME"].strip()
+        if table is None or table["table_name"] != name:
+            if table is not None:
+                yield table
+            table = {
+                "table_name": name,
+                "description": (row["TABREMARKS"] or "").strip() or None,
+                "columns": [],
+            }
+        if row["COLNAME"] is not None:
+            table["columns"].append({
+                "column_name": row["COLNAME"].strip(),
+                "data_type": format_data_type(row["TYPENAME"], row["LENGTH"], row["SCALE"]),
+                "description": (row["REMARKS"] or "").strip() or None,
+            })
+        row = ibm_db.fetch_assoc(stmt)
+    if table is not None:
+        yield table
+
+
+def batch_tables(tables, max_columns: int):
+    """Group streamed tables into batches of roughly max_columns columns."""
+    batch, size = [], 0
+    for table in tables:
+        batch.append(table)
+        size += max(len(table["columns"]), 1)
+        if size >= max_columns:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+
+def make_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class UploadStats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.tables = 0
+        self.columns = 0
+        self.batches = 0
+        self.retries = 0
+        self.lock = threading.Lock()
+
+    def add(self, tables: int, columns: int, retries: int):
+        with self.lock:
+            self.tables += tables
+            self.columns += columns
+            self.batches += 1
+            self.retries += retries
+
+    def summary(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (
+            f"{self.tables} table(s), {self.columns} column(s) in {self.batches} batch(es), "
+            f"{self.retries} retr{'y' if self.retries == 1 else 'ies'}, {elapsed:.1f}s "
+            f"({self.columns / elapsed:,.0f} rows/s)"
+        )
+
+
+def post_batch(
+    session: requests.Session, api_url: str, payload: dict,
+    retries: int = 3, backoff: float = 1.0,
+) -> tuple[dict, int]:
+    attempt = 0
+    while True:
+        try:
+            resp = session.post(f"{api_url}/api/catalog/ingest", json=payload, timeout=300)
+            if resp.status_code < 500:
+                resp.raise_for_status()
+                return resp.json(), attempt
+            error = requests.HTTPError(f"{resp.status_code} {resp.reason}", response=resp)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            error = exc
+        if attempt >= retries:
+            raise error
+        attempt += 1
+        time.sleep(backoff * 2 ** (attempt - 1))
+
+
+def upload_batches(session: requests.Session, api_url: str, payloads,
+                   concurrency: int, retries: int) -> UploadStats:
+    stats = UploadStats()
+    pending = set()
+
+    def upload(payload):
+        tables = [t for s in payload.get("schemas", []) for t in s["tables"]]
+        result, attempts = post_batch(session, api_url, payload, retries)
+        stats.add(len(tables), sum(len(t["columns"]) for t in tables), attempts)
+        print(
+            f"  batch of {len(tables)} table(s): "
+            f"tables {result['tables']}, columns {result['columns']}"
+        )
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for payload in payloads:
+            # Keep the cursor at most a couple of batches ahead of the uploads.
+            if len(pending) >= concurrency * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            pending.add(pool.submit(upload, payload))
+        for future in pending:
+            future.result()
+    return stats
+
+
+def import_streaming(conn, api_url: str, schema: str, table_pattern: str,
+                     batch_columns: int, concurrency: int, retries: int) -> UploadStats:
+    session = make_session(concurrency)
+    payloads = (
+        {"schemas": [{"schema_name": schema, "tables": batch}]}
+        for batch in batch_tables(stream_tables(conn, schema, table_pattern), batch_columns)
+    )
+    try:
+        return upload_batches(session, api_url, payloads, concurrency, retries)
+    finally:
+        session.close()
+
+
+def table_fingerprint(description: str | None, columns: list[tuple[str, str, str | None]]) -> str:
+    """Must match table_fingerprint() in backend/app/routers/catalog.py."""
+    ordered = sorted(columns, key=lambda c: (c[0], c[1], c[2] or ""))
+    doc = json.dumps([description, ordered], separators=(",", ":"))
+    return hashlib.sha1(doc.encode()).hexdigest()
+
+
+def fetch_fingerprints(session: requests.Session, api_url: str, schema: str,
+                       table_pattern: str) -> dict[str, str]:
+    resp = session.get(
+        f"{api_url}/api/catalog/fingerprints",
+        params={"schema_name": schema, "table_pattern": table_pattern},
+        timeout=300,
+    )
+    resp.raise_for_status()
+    return {t["table_name"]: t["fingerprint"] for t in resp.json()}
+
+
+def import_sync(conn, api_url: str, schema: str, table_pattern: str,
+                batch_columns: int, concurrency: int, retries: int) -> tuple[UploadStats, dict]:
+    session = make_session(concurrency)
+    remote = fetch_fingerprints(session, api_url, schema, table_pattern)
+    counts = {"added": 0, "changed": 0, "unchanged": 0, "dropped": 0}
+
+    def changed_tables():
+        for table in stream_tables(conn, schema, table_pattern):
+            fingerprint = table_fingerprint(
+                table["description"],
+                [(c["column_name"], c["data_type"], c["description"]) for c in table["columns"]],
+            )
+            known = remote.pop(table["table_name"], None)
+            if known == fingerprint:
+                counts["unchanged"] += 1
+                continue
+            counts["added" if known is None else "changed"] += 1
+            yield table
+
+    def payloads():
+        for batch in batch_tables(changed_tables(), batch_columns):
+            yield {"schemas": [{"schema_name": schema, "tables": batch}], "prune_columns": True}
+        # Whatever is left in `remote` was not seen in SYSCAT.
+        if remote:
+            counts["dropped"] = len(remote)
+            yield {
+                "schemas": [],
+                "drop_tables": [{"schema_name": schema, "table_name": name} for name in remote],
+            }
+
+    try:
+        stats = upload_batches(session, api_url, payloads(), concurrency, retries)
+    finally:
+        session.close()
+    return stats, counts
+
+
 def post_table(api_url: str, schema: str, table: dict) -> int:
     resp = requests.post(
         f"{api_url}/api/tables",
@@ -104,6 +309,27 @@ def main():
     parser.add_argument(
         "--api-url", default="http://localhost:8000", help="CSNX Meta backend URL"
     )
+    parser.add_argument(
+        "--mode",
+        choices=("per-table", "stream", "sync"),
+        default="per-table",
+        help="per-table: one catalog query and POST per table; "
+        "stream: one ordered catalog cursor, batched idempotent upserts; "
+        "sync: like stream, but only sends tables whose fingerprint changed "
+        "and drops tables that no longer exist (default: per-table)",
+    )
+    parser.add_argument(
+        "--batch-columns", type=int, default=5000,
+        help="stream/sync: approximate number of columns per upload batch (default: 5000)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4,
+        help="stream/sync: number of concurrent upload requests (default: 4)",
+    )
+    parser.add_argument(
+        "--retries", type=int, default=3,
+        help="stream/sync: retries per batch on connection errors or 5xx (default: 3)",
+    )
     args = parser.parse_args()
 
     # Connect to DB2
@@ -115,8 +341,31 @@ def main():
         sys.exit(1)
     print("Connected.")
 
-    # Fetch matching tables
     schema = args.schema.upper()
+
+    if args.mode == "stream":
+        stats = import_streaming(
+            conn, args.api_url, schema, args.table_pattern,
+            args.batch_columns, args.concurrency, args.retries,
+        )
+        ibm_db.close(conn)
+        print(f"\nDone: {stats.summary()}")
+        return
+
+    if args.mode == "sync":
+        stats, counts = import_sync(
+            conn, args.api_url, schema, args.table_pattern,
+            args.batch_columns, args.concurrency, args.retries,
+        )
+        ibm_db.close(conn)
+        print(
+            f"\nDone: {counts['added']} added, {counts['changed']} changed, "
+            f"{counts['unchanged']} unchanged, {counts['dropped']} dropped table(s); "
+            f"{stats.summary()}"
+        )
+        return
+
+    # Fetch matching tables
     tables = fetch_tables(conn, schema, args.table_pattern)
     print(f"Found {len(tables)} table(s) matching {schema}.{args.table_pattern}")
 